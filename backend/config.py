@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,6 +7,31 @@ load_dotenv()
 # SQLite & Cache settings
 SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "./f1_data.db")
 FASTF1_CACHE_DIR = os.getenv("FASTF1_CACHE_DIR", "./fastf1_cache")
+# Optional separate file for the telemetry table, attached as schema "tele".
+# Empty keeps telemetry in the main database.
+SQLITE_TELEMETRY_DB_PATH = os.getenv("SQLITE_TELEMETRY_DB_PATH", "")
+# Comma-separated loadable SQLite extensions (e.g. SQLean's stats), loaded
+# once per pooled connection. JSON functions are built into SQLite 3.38+.
+SQLITE_EXTENSIONS = [p.strip() for p in os.getenv("SQLITE_EXTENSIONS", "").split(",") if p.strip()]
+
+# API settings
+ENV = os.getenv("ENV", "development")
+# Comma-separated origins allowed to call the API from a browser. Defaults to
+# any origin in development and to none otherwise.
+CORS_ALLOW_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "*" if ENV == "development" else "").split(",")
+    if origin.strip()
+)
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "64"))
+# max-age sent with ETag'd responses from the historical routes.
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+# Seconds between background reloads of the per-year historical responses.
+CACHE_WARM_INTERVAL = float(os.getenv("CACHE_WARM_INTERVAL", "1800"))
+# Lock file that picks the single worker process running live polling.
+POLLER_LOCK_PATH = os.getenv("POLLER_LOCK_PATH", os.path.join(tempfile.gettempdir(), "f1api-poller.lock"))
+# Seconds between live snapshots pushed to /ws/live subscribers.
+LIVE_PUSH_INTERVAL = float(os.getenv("LIVE_PUSH_INTERVAL", "1"))
 
 # Redis settings (external – from RedisLabs)
 REDIS_HOST = os.getenv("REDIS_HOST")
@@ -1,23 +1,396 @@
+import asyncio
+import json
 import sqlite3
 import logging
 import os
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+import time
+import functools
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import List, Dict, Any, Callable, Hashable, Iterator, Optional, Tuple
 
-from config import SQLITE_DB_PATH
+import numpy as np
+import pandas as pd
+
+from config import SQLITE_DB_PATH, SQLITE_EXTENSIONS, SQLITE_TELEMETRY_DB_PATH
 from redis_live_service import RedisLiveDataService
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Connection-level tuning applied once per connection. WAL keeps reads from
+# blocking while the migration scripts write, and the larger page cache plus
+# mmap keep the small, hot tables (events, sessions, drivers) in memory.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Flag columns are stored as 0/1. Columns declared BOOLEAN, or selected as
+# "col [BOOLEAN]", come back as Python bools straight from the driver.
+sqlite3.register_converter("BOOLEAN", lambda value: value == b'1')
+
+# Prepared statements kept per connection (the sqlite3 default is 128).
+SQLITE_CACHED_STATEMENTS = 256
+
+# Upper bound on entries held by the in-memory results cache.
+RESULTS_CACHE_MAXSIZE = 1024
+
+# TTL for the pre-rendered JSON bodies served by the historical routes. Those
+# rows only change when a migration writes, and any write already clears the
+# cache through data_version, so they can be kept much longer than 60s.
+HISTORICAL_CACHE_TTL = 3600
+
+# Seconds a value read from Redis is reused in-process. The poller refreshes
+# Redis about once a second, so this hides the round-trip without serving
+# anything older than one poll cycle.
+LIVE_CACHE_TTL = 1.0
+
+# Rows pulled per fetchmany() call when streaming large result sets.
+FETCH_CHUNK_SIZE = 512
+
+# Output keys for each query, in SELECT column order, so rows can be turned
+# into dicts with dict(zip(keys, row)) instead of per-column lookups.
+_STANDING_KEYS = (
+    'position', 'driver_id', 'driver_name', 'abbreviation', 'team',
+    'team_color', 'points',
+)
+_TELEMETRY_KEYS = (
+    'time', 'session_time', 'date', 'speed', 'rpm', 'gear', 'throttle',
+    'brake', 'drs', 'x', 'y', 'z',
+)
+
+# Position of each session type within an event weekend. Stored per row in
+# sessions.session_order so listing an event's sessions is an index range scan
+# on (event_id, session_order) instead of a sort over a CASE expression.
+SESSION_ORDER = {
+    'practice': 1,
+    'qualifying': 2,
+    'sprint_shootout': 3,
+    'sprint_qualifying': 4,
+    'sprint': 5,
+    'race': 6,
+}
+SESSION_ORDER_DEFAULT = 7
+
+def session_order(session_type: Optional[str]) -> int:
+    return SESSION_ORDER.get(session_type, SESSION_ORDER_DEFAULT)
+
+_EMPTY_TELEMETRY_COLUMNS_JSON = json.dumps({key: [] for key in _TELEMETRY_KEYS})
+
+def ensure_session_order(cursor: sqlite3.Cursor) -> bool:
+    """
+    Add and backfill sessions.session_order on databases created before the
+    column existed. Returns True if the schema was changed.
+    """
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(sessions)")}
+    if not columns or 'session_order' in columns:
+        return False
+    cursor.execute("ALTER TABLE sessions ADD COLUMN session_order INTEGER")
+    cursor.executemany(
+        "UPDATE sessions SET session_order = ? WHERE session_type = ?",
+        [(order, session_type) for session_type, order in SESSION_ORDER.items()],
+    )
+    cursor.execute(
+        "UPDATE sessions SET session_order = ? WHERE session_order IS NULL",
+        (SESSION_ORDER_DEFAULT,),
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_event_order ON sessions(event_id, session_order)"
+    )
+    return True
+
+# Season driver standings, one row per (year, driver). Rebuilt by
+# refresh_driver_standings() after results are loaded, so the standings
+# endpoint reads precomputed rows instead of aggregating results per request.
+DRIVER_STANDINGS_CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS driver_standings_cache (
+        year INTEGER NOT NULL,
+        driver_id INTEGER NOT NULL,
+        points REAL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (year, driver_id),
+        FOREIGN KEY(driver_id) REFERENCES drivers(id)
+    )
+"""
+
+def refresh_driver_standings(cursor: sqlite3.Cursor, year: Optional[int] = None) -> None:
+    """Recompute driver_standings_cache for one year, or for every year if None."""
+    cursor.execute(DRIVER_STANDINGS_CACHE_DDL)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_driver_standings_cache_position "
+        "ON driver_standings_cache(year, position)"
+    )
+    cursor.execute(
+        "DELETE FROM driver_standings_cache WHERE ? IS NULL OR year = ?", (year, year)
+    )
+    cursor.execute("""
+        INSERT INTO driver_standings_cache (year, driver_id, points, position)
+        SELECT e.year, r.driver_id, SUM(r.points),
+               ROW_NUMBER() OVER (
+                   PARTITION BY e.year ORDER BY SUM(r.points) DESC, r.driver_id
+               )
+        FROM results r
+        JOIN sessions s ON r.session_id = s.id
+        JOIN events e ON s.event_id = e.id
+        WHERE s.session_type = 'race' AND (? IS NULL OR e.year = ?)
+        GROUP BY e.year, r.driver_id
+    """, (year, year))
+
+def ensure_driver_standings_cache(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create and fill driver_standings_cache on databases that predate it.
+    Returns True if the table was built.
+    """
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+        ('results', 'driver_standings_cache'),
+    )
+    if len(cursor.fetchall()) != 1:
+        # Either the schema isn't there yet or the cache already exists.
+        return False
+    refresh_driver_standings(cursor)
+    return True
+
+# Fixed little-endian record layout for packed telemetry: 8 bytes per sample
+# instead of ~150 bytes of JSON. Values are rounded and clipped to each range.
+TELEMETRY_PACKED_DTYPE = np.dtype([
+    ('speed', '<u2'),     # km/h
+    ('rpm', '<u2'),
+    ('gear', 'u1'),
+    ('throttle', 'u1'),   # percent
+    ('brake', 'u1'),      # 0/1
+    ('drs', 'u1'),        # raw FastF1 DRS code
+])
+
+def cached(ttl: float = 60):
+    """
+    Cache a read method's result per (method, args) for ``ttl`` seconds.
+    Every entry is dropped as soon as PRAGMA data_version shows that another
+    connection (e.g. a migration run) has written to the database.
+    Live (Redis-backed) methods must not use this.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            return self._cached_call(key, ttl, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
 class F1DataService:
     """
     Abstraction layer for F1 data access.
     Provides a unified interface for accessing historical (SQLite)
     and live (Redis) data.
+
+    SQLite access goes through a small pool of read-only connections, so
+    concurrent requests don't serialize on one connection and each keeps its
+    page cache warm across requests. The API never writes; the only write is
+    the one-off deferred transaction in _upgrade_schema() at startup.
+    """
+    # SQL text is kept as class-level constants so every call passes identical
+    # text and hits the connection's prepared-statement cache.
+    _Q_YEARS = "SELECT DISTINCT year FROM events ORDER BY year DESC"
+
+    _Q_DRIVER_STANDINGS = """
+        SELECT c.position, d.id, d.full_name, d.abbreviation,
+               t.name as team_name, t.team_color, c.points
+        FROM driver_standings_cache c
+        JOIN drivers d ON c.driver_id = d.id
+        JOIN teams t ON d.team_id = t.id
+        WHERE c.year = ?
+        ORDER BY c.position
+    """
+
+    _Q_TELEMETRY = """
+        SELECT time, session_time, date, speed, rpm, gear, throttle,
+               brake AS "brake [BOOLEAN]", drs, x, y, z
+        FROM telemetry
+        WHERE session_id = ? AND driver_id = ? AND lap_number = ?
+        ORDER BY session_time
+    """
+
+    # JSON queries: SQLite builds the response body with json_group_array/
+    # json_object, so no Python rows or json.dumps are involved.
+    _Q_EVENTS_JSON = """
+        SELECT json_group_array(json_object(
+            'id', id, 'round_number', round_number, 'country', country,
+            'location', location, 'official_event_name', official_event_name,
+            'event_name', event_name, 'event_date', event_date,
+            'event_format', event_format,
+            'f1_api_support', json(CASE WHEN f1_api_support THEN 'true' ELSE 'false' END)
+        ))
+        FROM (
+            SELECT * FROM events
+            WHERE year = ?
+            ORDER BY round_number
+        )
+    """
+
+    _Q_SESSIONS_JSON = """
+        SELECT json_group_array(json_object(
+            'id', id, 'name', name, 'date', date, 'session_type', session_type,
+            'total_laps', total_laps, 'session_start_time', session_start_time,
+            't0_date', t0_date
+        ))
+        FROM (
+            SELECT * FROM sessions
+            WHERE event_id = ?
+            ORDER BY session_order
+        )
+    """
+
+    _Q_EVENT_JSON = """
+        SELECT json_object(
+            'id', id, 'round_number', round_number, 'country', country,
+            'location', location, 'official_event_name', official_event_name,
+            'event_name', event_name, 'event_date', event_date,
+            'event_format', event_format,
+            'f1_api_support', json(CASE WHEN f1_api_support THEN 'true' ELSE 'false' END)
+        )
+        FROM events
+        WHERE year = ? AND round_number = ?
+    """
+
+    _Q_TEAMS_JSON = """
+        SELECT json_group_array(json_object(
+            'id', id, 'name', name, 'team_id', team_id, 'team_color', team_color
+        ))
+        FROM (
+            SELECT * FROM teams
+            WHERE year = ?
+            ORDER BY name
+        )
     """
-    def __init__(self, sqlite_path: str = SQLITE_DB_PATH):
+
+    # get_drivers_json has two fixed variants rather than a concatenated query
+    # so both the filtered and unfiltered forms stay in the statement cache.
+    _Q_DRIVERS_JSON = """
+        SELECT json_group_array(json_object(
+            'id', id, 'driver_number', driver_number, 'broadcast_name', broadcast_name,
+            'abbreviation', abbreviation, 'driver_id', driver_id,
+            'first_name', first_name, 'last_name', last_name, 'full_name', full_name,
+            'headshot_url', headshot_url, 'country_code', country_code,
+            'team_id', team_id, 'team_name', team_name, 'team_color', team_color
+        ))
+        FROM (
+            SELECT d.id, d.driver_number, d.broadcast_name, d.abbreviation,
+                   d.driver_id, d.first_name, d.last_name, d.full_name,
+                   d.headshot_url, d.country_code, d.team_id, t.name as team_name,
+                   t.team_color
+            FROM drivers d
+            JOIN teams t ON d.team_id = t.id
+            WHERE d.year = ?
+            ORDER BY t.name, d.full_name
+        )
+    """
+
+    _Q_DRIVERS_BY_TEAM_JSON = """
+        SELECT json_group_array(json_object(
+            'id', id, 'driver_number', driver_number, 'broadcast_name', broadcast_name,
+            'abbreviation', abbreviation, 'driver_id', driver_id,
+            'first_name', first_name, 'last_name', last_name, 'full_name', full_name,
+            'headshot_url', headshot_url, 'country_code', country_code,
+            'team_id', team_id, 'team_name', team_name, 'team_color', team_color
+        ))
+        FROM (
+            SELECT d.id, d.driver_number, d.broadcast_name, d.abbreviation,
+                   d.driver_id, d.first_name, d.last_name, d.full_name,
+                   d.headshot_url, d.country_code, d.team_id, t.name as team_name,
+                   t.team_color
+            FROM drivers d
+            JOIN teams t ON d.team_id = t.id
+            WHERE d.year = ? AND d.team_id = ?
+            ORDER BY t.name, d.full_name
+        )
+    """
+
+    # Telemetry dates are stored as epoch nanoseconds, which exceed 2**53 and
+    # would lose precision as JavaScript numbers, so JSON carries milliseconds.
+    _Q_TELEMETRY_JSON = """
+        SELECT json_group_array(json_object(
+            'time', time, 'session_time', session_time, 'date', date / 1000000,
+            'speed', speed, 'rpm', rpm, 'gear', gear, 'throttle', throttle,
+            'brake', json(CASE WHEN brake THEN 'true' ELSE 'false' END),
+            'drs', drs, 'x', x, 'y', y, 'z', z
+        ))
+        FROM (
+            SELECT * FROM telemetry
+            WHERE session_id = ? AND driver_id = ? AND lap_number = ?
+            ORDER BY session_time
+        )
+    """
+
+    _Q_DRIVER_STANDINGS_JSON = """
+        SELECT json_group_array(json_object(
+            'position', position, 'driver_id', id, 'driver_name', full_name,
+            'abbreviation', abbreviation, 'team', team_name,
+            'team_color', team_color, 'points', points
+        ))
+        FROM (%s)
+    """ % _Q_DRIVER_STANDINGS
+
+    # One JSON object per sample, for line-delimited streaming.
+    _Q_TELEMETRY_ROWS_JSON = """
+        SELECT json_object(
+            'time', time, 'session_time', session_time, 'date', date / 1000000,
+            'speed', speed, 'rpm', rpm, 'gear', gear, 'throttle', throttle,
+            'brake', json(CASE WHEN brake THEN 'true' ELSE 'false' END),
+            'drs', drs, 'x', x, 'y', y, 'z', z
+        )
+        FROM telemetry
+        WHERE session_id = ? AND driver_id = ? AND lap_number = ?
+        ORDER BY session_time
+    """
+
+    # Column-oriented variant: one JSON array per channel, in sample order.
+    _Q_TELEMETRY_COLUMNS_JSON = """
+        SELECT json_object(
+            'time', json_group_array(time),
+            'session_time', json_group_array(session_time),
+            'date', json_group_array(date / 1000000),
+            'speed', json_group_array(speed),
+            'rpm', json_group_array(rpm),
+            'gear', json_group_array(gear),
+            'throttle', json_group_array(throttle),
+            'brake', json_group_array(json(CASE WHEN brake THEN 'true' ELSE 'false' END)),
+            'drs', json_group_array(drs),
+            'x', json_group_array(x),
+            'y', json_group_array(y),
+            'z', json_group_array(z)
+        )
+        FROM (
+            SELECT * FROM telemetry
+            WHERE session_id = ? AND driver_id = ? AND lap_number = ?
+            ORDER BY session_time
+        )
+    """
+
+    def __init__(self, sqlite_path: str = SQLITE_DB_PATH, pool_size: Optional[int] = None):
         self.sqlite_path = sqlite_path
-        self.sqlite_conn: Optional[sqlite3.Connection] = None
+        self.pool_size = pool_size or os.cpu_count() or 4
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        # Dedicated connection used only to read PRAGMA data_version.
+        self._version_conn: Optional[sqlite3.Connection] = None
+        # Whether _version_conn has the telemetry file attached as "tele".
+        self._version_tele = False
+        self._version_lock = threading.Lock()
+        self._cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._cache_version: Optional[int] = None
+        self._cache_lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._live_cache: Dict[str, Tuple[float, Any]] = {}
         self.redis_service: Optional[RedisLiveDataService] = None
         self._init_sqlite()
         try:
@@ -27,48 +400,273 @@ class F1DataService:
             logger.warning(f"Redis live data service not available: {e}")
             self.redis_service = None
 
+    def _connect(self) -> sqlite3.Connection:
+        # The API serves requests from a threadpool, so connections must be
+        # usable outside the thread that opened them.
+        # mode=rw opens an existing file only (no empty database is created on a
+        # bad path) and cache=private keeps each connection's page cache its own.
+        conn = sqlite3.connect(
+            f"file:{urllib.parse.quote(self.sqlite_path)}?mode=rw&cache=private",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        if SQLITE_EXTENSIONS:
+            self._load_extensions(conn)
+        if SQLITE_TELEMETRY_DB_PATH:
+            self._attach_telemetry(conn)
+        self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _attach_telemetry(conn: sqlite3.Connection) -> None:
+        # Unqualified "telemetry" resolves to tele.telemetry once the main
+        # database has no table of that name (the migration drops it).
+        try:
+            conn.execute(
+                "ATTACH DATABASE ? AS tele",
+                (f"file:{urllib.parse.quote(SQLITE_TELEMETRY_DB_PATH)}?mode=ro",)
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Telemetry database not available: {SQLITE_TELEMETRY_DB_PATH} ({e})")
+
+    @staticmethod
+    def _telemetry_attached(conn: sqlite3.Connection) -> bool:
+        return bool(SQLITE_TELEMETRY_DB_PATH) and any(
+            row[1] == 'tele' for row in conn.execute("PRAGMA database_list")
+        )
+
+    @staticmethod
+    def _load_extensions(conn: sqlite3.Connection) -> None:
+        # Some Python builds ship without extension loading; queries that
+        # need an extension then fail on their own and log as usual.
+        try:
+            conn.enable_load_extension(True)
+        except (AttributeError, sqlite3.Error) as e:
+            logger.warning(f"SQLite extension loading unavailable: {e}")
+            return
+        try:
+            for extension in SQLITE_EXTENSIONS:
+                try:
+                    conn.load_extension(extension)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not load SQLite extension {extension}: {e}")
+        finally:
+            conn.enable_load_extension(False)
+
     def _init_sqlite(self) -> None:
+        with self._pool_lock:
+            if self._connections:
+                return
+            try:
+                self._version_conn = self._connect()
+                self._version_tele = self._telemetry_attached(self._version_conn)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite database not available: {self.sqlite_path} ({e})")
+                self._close_connections()
+                return
+            try:
+                for _ in range(self.pool_size):
+                    self._read_pool.put(self._connect())
+                logger.info(
+                    f"Connected to SQLite database: {self.sqlite_path} "
+                    f"({self.pool_size} readers)"
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Error connecting to SQLite database: {e}")
+                self._close_connections()
+                return
+        self._upgrade_schema()
+
+    def _upgrade_schema(self) -> None:
+        """
+        Add session_order / driver_standings_cache to databases written before
+        they existed (migrate_sqlite.create_tables() does the same). The checks
+        only read, so the write lock is taken only if something is missing; if
+        that fails, e.g. while a migration holds the lock, the readers keep
+        serving and the upgrade is retried on the next start.
+        """
+        conn = self._read_pool.get()
+        cursor = conn.cursor()
         try:
-            if os.path.exists(self.sqlite_path):
-                self.sqlite_conn = sqlite3.connect(self.sqlite_path)
-                self.sqlite_conn.row_factory = sqlite3.Row
-                logger.info(f"Connected to SQLite database: {self.sqlite_path}")
-            else:
-                logger.warning(f"SQLite database does not exist: {self.sqlite_path}")
-                self.sqlite_conn = None
+            cursor.execute("BEGIN")
+            if ensure_session_order(cursor):
+                logger.info("Added sessions.session_order column")
+            if ensure_driver_standings_cache(cursor):
+                logger.info("Built driver_standings_cache")
+            conn.commit()
         except sqlite3.Error as e:
-            logger.error(f"Error connecting to SQLite database: {e}")
-            self.sqlite_conn = None
+            conn.rollback()
+            logger.warning(f"Could not upgrade SQLite schema, serving as is: {e}")
+        finally:
+            cursor.close()
+            self._read_pool.put(conn)
+
+    def _close_connections(self) -> None:
+        while not self._read_pool.empty():
+            self._read_pool.get_nowait()
+        with self._version_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+            self._version_conn = None
+            self._version_tele = False
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_version = None
 
-    def _get_sqlite_cursor(self) -> Optional[sqlite3.Cursor]:
-        if not self.sqlite_conn:
+    def _data_version(self) -> Optional[int]:
+        """Return PRAGMA data_version, or None if the database is unavailable."""
+        if self._version_conn is None:
             self._init_sqlite()
-        if self.sqlite_conn:
-            return self.sqlite_conn.cursor()
-        return None
+        with self._version_lock:
+            if self._version_conn is None:
+                return None
+            try:
+                version = self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+                if self._version_tele:
+                    # Telemetry commits land in the attached file.
+                    version += self._version_conn.execute("PRAGMA tele.data_version").fetchone()[0]
+                return version
+            except sqlite3.Error as e:
+                logger.error(f"Error reading data_version: {e}")
+                return None
+
+    def _cached_call(self, key: Hashable, ttl: float, compute: Callable[[], Any]) -> Any:
+        version = self._data_version()
+        if version is None:
+            # Nothing to validate against; don't cache empty fallbacks.
+            return compute()
+        with self._cache_lock:
+            # data_version only grows; a smaller value is just a slower thread.
+            if self._cache_version is None or version > self._cache_version:
+                self._cache.clear()
+                self._cache_version = version
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return entry[1]
+            # Single flight: on a miss only the first caller computes; callers
+            # arriving meanwhile wait for its result instead of re-querying.
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            return pending.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+        pending.set_result(value)
+        with self._cache_lock:
+            # Skip the store if the data changed while we were computing.
+            if self._cache_version == version:
+                self._cache[key] = (time.monotonic() + ttl, value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > RESULTS_CACHE_MAXSIZE:
+                    self._cache.popitem(last=False)
+        return value
+
+    @contextmanager
+    def _borrow(self) -> Iterator[Optional[sqlite3.Cursor]]:
+        """
+        Borrow a pooled reader for the duration of the block and yield a
+        cursor on it, or None if the database is unavailable.
+        """
+        if not self._connections:
+            self._init_sqlite()
+        if not self._connections:
+            yield None
+            return
+        conn = self._read_pool.get()
+        cursor = conn.cursor()
+        cursor.arraysize = FETCH_CHUNK_SIZE
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            self._read_pool.put(conn)
+
+    def _fetch_json(self, query: str, params: Tuple[Any, ...], empty: str = "[]") -> str:
+        """
+        Run a json_group_array query and return its single JSON text value,
+        or ``empty`` if the database is unavailable.
+        """
+        with self._borrow() as cursor:
+            if not cursor:
+                return empty
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
 
     def close(self) -> None:
-        if self.sqlite_conn:
-            self.sqlite_conn.close()
-            logger.info("Closed SQLite connection")
+        with self._pool_lock:
+            if self._connections:
+                self._close_connections()
+                logger.info("Closed SQLite connections")
         if self.redis_service:
             self.redis_service.stop_polling()
             logger.info("Stopped Redis polling")
 
+    def __enter__(self) -> "F1DataService":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def warm_cache(self) -> None:
+        """
+        Load the per-year roster and calendar bodies (events, teams, drivers,
+        season standings) into the results cache so the first request for
+        each year doesn't go to the database.
+        """
+        for year in self.get_available_years():
+            self.get_events_json(year)
+            self.get_teams_json(year)
+            # Same arguments as the /drivers route, so the cache key matches.
+            self.get_drivers_json(year, None)
+            self._get_driver_standings_json_from_db(year)
+
+    @cached(ttl=60)
     def get_available_years(self) -> List[int]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return []
-        try:
-            cursor.execute("SELECT DISTINCT year FROM events ORDER BY year DESC")
-            return [row[0] for row in cursor.fetchall()]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting available years: {e}")
-            return []
+        with self._borrow() as cursor:
+            if not cursor:
+                return []
+            try:
+                cursor.execute(self._Q_YEARS)
+                return [row[0] for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Error getting available years: {e}")
+                return []
+
+    def _live_cached(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Reuse a Redis read for LIVE_CACHE_TTL seconds (dict ops are atomic under the GIL)."""
+        entry = self._live_cache.get(key)
+        now = time.monotonic()
+        if entry and entry[0] > now:
+            return entry[1]
+        value = fetch()
+        self._live_cache[key] = (now + LIVE_CACHE_TTL, value)
+        return value
 
     def get_current_session(self) -> Optional[Dict[str, Any]]:
         if self.redis_service:
-            return self.redis_service.get_live_session()
+            return self._live_cached("live_session", self.redis_service.get_live_session)
+        return None
+
+    def get_live_snapshot(self) -> Optional[Dict[str, Any]]:
+        if self.redis_service:
+            return self.redis_service.get_live_snapshot()
         return None
 
     def start_live_polling(self) -> bool:
@@ -77,203 +675,190 @@ class F1DataService:
             return True
         return False
 
-    def get_events(self, year: int) -> List[Dict[str, Any]]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return []
-        try:
-            cursor.execute("""
-                SELECT id, round_number, country, location, official_event_name,
-                       event_name, event_date, event_format, f1_api_support
-                FROM events
-                WHERE year = ?
-                ORDER BY round_number
-            """, (year,))
-            events = []
-            for row in cursor.fetchall():
-                events.append({
-                    'id': row['id'],
-                    'round_number': row['round_number'],
-                    'country': row['country'],
-                    'location': row['location'],
-                    'official_event_name': row['official_event_name'],
-                    'event_name': row['event_name'],
-                    'event_date': row['event_date'],
-                    'event_format': row['event_format'],
-                    'f1_api_support': bool(row['f1_api_support'])
-                })
-            return events
-        except sqlite3.Error as e:
-            logger.error(f"Error getting events: {e}")
-            return []
+    async def run_live_polling(self) -> None:
+        """Poll live data on the running event loop until cancelled."""
+        if self.redis_service:
+            await self.redis_service.poll_forever()
 
-    def get_event(self, year: int, round_number: int) -> Optional[Dict[str, Any]]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return None
+    @cached(ttl=HISTORICAL_CACHE_TTL)
+    def get_events_json(self, year: int) -> str:
+        """A season's events, serialized to a JSON array by SQLite."""
         try:
-            cursor.execute("""
-                SELECT id, round_number, country, location, official_event_name,
-                       event_name, event_date, event_format, f1_api_support
-                FROM events
-                WHERE year = ? AND round_number = ?
-            """, (year, round_number))
-            row = cursor.fetchone()
-            if row:
-                return {
-                    'id': row['id'],
-                    'round_number': row['round_number'],
-                    'country': row['country'],
-                    'location': row['location'],
-                    'official_event_name': row['official_event_name'],
-                    'event_name': row['event_name'],
-                    'event_date': row['event_date'],
-                    'event_format': row['event_format'],
-                    'f1_api_support': bool(row['f1_api_support'])
-                }
-            return None
+            return self._fetch_json(self._Q_EVENTS_JSON, (year,))
         except sqlite3.Error as e:
-            logger.error(f"Error getting event: {e}")
-            return None
+            logger.error(f"Error getting events as JSON: {e}")
+            return "[]"
+
+    @cached(ttl=HISTORICAL_CACHE_TTL)
+    def get_event_json(self, year: int, round_number: int) -> Optional[str]:
+        """One event as a JSON object rendered by SQLite, or None."""
+        with self._borrow() as cursor:
+            if not cursor:
+                return None
+            try:
+                cursor.execute(self._Q_EVENT_JSON, (year, round_number))
+                row = cursor.fetchone()
+                return row[0] if row else None
+            except sqlite3.Error as e:
+                logger.error(f"Error getting event as JSON: {e}")
+                return None
 
-    def get_sessions(self, event_id: int) -> List[Dict[str, Any]]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return []
+    @cached(ttl=HISTORICAL_CACHE_TTL)
+    def get_sessions_json(self, event_id: int) -> str:
+        """An event's sessions in weekend order, serialized to a JSON array by SQLite."""
         try:
-            cursor.execute("""
-                SELECT id, name, date, session_type, total_laps, session_start_time, t0_date
-                FROM sessions
-                WHERE event_id = ?
-                ORDER BY CASE 
-                    WHEN session_type = 'practice' THEN 1
-                    WHEN session_type = 'qualifying' THEN 2
-                    WHEN session_type = 'sprint_shootout' THEN 3
-                    WHEN session_type = 'sprint_qualifying' THEN 4
-                    WHEN session_type = 'sprint' THEN 5
-                    WHEN session_type = 'race' THEN 6
-                    ELSE 7
-                END
-            """, (event_id,))
-            sessions = []
-            for row in cursor.fetchall():
-                sessions.append({
-                    'id': row['id'],
-                    'name': row['name'],
-                    'date': row['date'],
-                    'session_type': row['session_type'],
-                    'total_laps': row['total_laps'],
-                    'session_start_time': row['session_start_time'],
-                    't0_date': row['t0_date']
-                })
-            return sessions
+            return self._fetch_json(self._Q_SESSIONS_JSON, (event_id,))
         except sqlite3.Error as e:
-            logger.error(f"Error getting sessions: {e}")
-            return []
+            logger.error(f"Error getting sessions as JSON: {e}")
+            return "[]"
 
-    def get_teams(self, year: int) -> List[Dict[str, Any]]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return []
+    @cached(ttl=HISTORICAL_CACHE_TTL)
+    def get_teams_json(self, year: int) -> str:
+        """A season's teams, serialized to a JSON array by SQLite."""
         try:
-            cursor.execute("""
-                SELECT id, name, team_id, team_color
-                FROM teams
-                WHERE year = ?
-                ORDER BY name
-            """, (year,))
-            teams = []
-            for row in cursor.fetchall():
-                teams.append({
-                    'id': row['id'],
-                    'name': row['name'],
-                    'team_id': row['team_id'],
-                    'team_color': row['team_color']
-                })
-            return teams
+            return self._fetch_json(self._Q_TEAMS_JSON, (year,))
         except sqlite3.Error as e:
-            logger.error(f"Error getting teams: {e}")
-            return []
+            logger.error(f"Error getting teams as JSON: {e}")
+            return "[]"
 
-    def get_drivers(self, year: int, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return []
+    @cached(ttl=HISTORICAL_CACHE_TTL)
+    def get_drivers_json(self, year: int, team_id: Optional[int] = None) -> str:
+        """A season's drivers, optionally for one team, serialized to a JSON array by SQLite."""
         try:
-            query = """
-                SELECT d.id, d.driver_number, d.broadcast_name, d.abbreviation,
-                       d.driver_id, d.first_name, d.last_name, d.full_name,
-                       d.headshot_url, d.country_code, d.team_id, t.name as team_name,
-                       t.team_color
-                FROM drivers d
-                JOIN teams t ON d.team_id = t.id
-                WHERE d.year = ?
-            """
-            params = [year]
-            if team_id is not None:
-                query += " AND d.team_id = ?"
-                params.append(team_id)
-            query += " ORDER BY t.name, d.full_name"
-            cursor.execute(query, tuple(params))
-            drivers = []
-            for row in cursor.fetchall():
-                drivers.append({
-                    'id': row['id'],
-                    'driver_number': row['driver_number'],
-                    'broadcast_name': row['broadcast_name'],
-                    'abbreviation': row['abbreviation'],
-                    'driver_id': row['driver_id'],
-                    'first_name': row['first_name'],
-                    'last_name': row['last_name'],
-                    'full_name': row['full_name'],
-                    'headshot_url': row['headshot_url'],
-                    'country_code': row['country_code'],
-                    'team_id': row['team_id'],
-                    'team_name': row['team_name'],
-                    'team_color': row['team_color']
-                })
-            return drivers
+            if team_id is None:
+                return self._fetch_json(self._Q_DRIVERS_JSON, (year,))
+            return self._fetch_json(self._Q_DRIVERS_BY_TEAM_JSON, (year, team_id))
         except sqlite3.Error as e:
-            logger.error(f"Error getting drivers: {e}")
-            return []
+            logger.error(f"Error getting drivers as JSON: {e}")
+            return "[]"
 
     def get_driver_standings(self, year: int) -> List[Dict[str, Any]]:
-        cursor = self._get_sqlite_cursor()
-        if not cursor:
-            return []
+        """
+        Live standings from Redis when a session for this year is running,
+        otherwise the season standings from SQLite.
+        """
+        return self._get_live_standings(year) or self._get_driver_standings_from_db(year)
+
+    async def get_driver_standings_json(self, year: int) -> str:
+        """Same standings as get_driver_standings, as JSON text ready to send."""
+        return await self._live_or_db(
+            self._get_live_standings_json, self._get_driver_standings_json_from_db, year
+        )
+
+    async def _live_or_db(self, live: Callable[[int], Any], db: Callable[[int], Any], year: int) -> Any:
+        # The live lookup is cached for LIVE_CACHE_TTL, so checking it first is
+        # cheap; the database is only read (in a worker thread) when it misses.
+        if self.redis_service:
+            live_result = await asyncio.to_thread(live, year)
+            if live_result:
+                return live_result
+        return await asyncio.to_thread(db, year)
+
+    def _live_session_matches(self, year: int) -> bool:
         # Check if live standings are available (via Redis)
         current_session = self.get_current_session()
-        if current_session and current_session.get('year') == year and self.redis_service:
-            live_standings = self.redis_service.get_live_standings()
-            if live_standings:
-                return live_standings
+        return bool(current_session and current_session.get('year') == year and self.redis_service)
+
+    def _get_live_standings(self, year: int) -> Optional[List[Dict[str, Any]]]:
+        if self._live_session_matches(year):
+            return self._live_cached("live_standings", self.redis_service.get_live_standings)
+        return None
+
+    def _get_live_standings_json(self, year: int) -> Optional[str]:
+        if self._live_session_matches(year):
+            return self._live_cached("live_standings_json", self.redis_service.get_live_standings_json)
+        return None
+
+    @cached(ttl=HISTORICAL_CACHE_TTL)
+    def _get_driver_standings_json_from_db(self, year: int) -> str:
+        try:
+            return self._fetch_json(self._Q_DRIVER_STANDINGS_JSON, (year,))
+        except sqlite3.Error as e:
+            logger.error(f"Error getting driver standings as JSON: {e}")
+            return "[]"
+
+    @cached(ttl=60)
+    def _get_driver_standings_from_db(self, year: int) -> List[Dict[str, Any]]:
+        with self._borrow() as cursor:
+            if not cursor:
+                return []
+            try:
+                cursor.execute(self._Q_DRIVER_STANDINGS, (year,))
+                return [dict(zip(_STANDING_KEYS, row)) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logger.error(f"Error getting driver standings: {e}")
+                return []
+
+    def get_telemetry_json(self, session_id: int, driver_id: int, lap_number: int) -> str:
+        """One lap of telemetry samples as a JSON array, serialized by SQLite."""
         try:
-            cursor.execute("""
-                SELECT d.id, d.full_name, d.abbreviation, t.name as team_name, t.team_color,
-                       SUM(r.points) as total_points
-                FROM drivers d
-                JOIN teams t ON d.team_id = t.id
-                JOIN results r ON d.id = r.driver_id
-                JOIN sessions s ON r.session_id = s.id
-                JOIN events e ON s.event_id = e.id
-                WHERE e.year = ? AND s.session_type = 'race'
-                GROUP BY d.id
-                ORDER BY total_points DESC
-            """, (year,))
-            standings = []
-            for i, row in enumerate(cursor.fetchall()):
-                standings.append({
-                    'position': i + 1,
-                    'driver_id': row['id'],
-                    'driver_name': row['full_name'],
-                    'abbreviation': row['abbreviation'],
-                    'team': row['team_name'],
-                    'team_color': row['team_color'],
-                    'points': row['total_points']
-                })
-            return standings
+            return self._fetch_json(self._Q_TELEMETRY_JSON, (session_id, driver_id, lap_number))
         except sqlite3.Error as e:
-            logger.error(f"Error getting driver standings: {e}")
-            return []
+            logger.error(f"Error getting telemetry as JSON: {e}")
+            return "[]"
+
+    def get_telemetry_frame(self, session_id: int, driver_id: int, lap_number: int) -> pd.DataFrame:
+        """
+        Load one lap of telemetry column-wise. pandas reads the rows in a single
+        pass and keeps each channel as a contiguous array, so no per-sample dict
+        is built; brake comes back as a nullable boolean column.
+        """
+        with self._borrow() as cursor:
+            if not cursor:
+                return pd.DataFrame(columns=list(_TELEMETRY_KEYS))
+            try:
+                frame = pd.read_sql_query(
+                    self._Q_TELEMETRY, cursor.connection,
+                    params=(session_id, driver_id, lap_number)
+                )
+            except (sqlite3.Error, pd.errors.DatabaseError) as e:
+                logger.error(f"Error getting telemetry frame: {e}")
+                return pd.DataFrame(columns=list(_TELEMETRY_KEYS))
+        frame['brake'] = frame['brake'].astype('boolean')
+        return frame
+
+    def get_telemetry_ndjson(self, session_id: int, driver_id: int, lap_number: int) -> Iterator[str]:
+        """
+        Stream one lap as NDJSON. SQLite renders each sample as a JSON object;
+        every fetchmany() batch is yielded as one chunk of newline-terminated
+        lines, so only a chunk is ever held in memory.
+        """
+        with self._borrow() as cursor:
+            if not cursor:
+                return
+            try:
+                cursor.execute(self._Q_TELEMETRY_ROWS_JSON, (session_id, driver_id, lap_number))
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    yield "".join(row[0] + "\n" for row in rows)
+            except sqlite3.Error as e:
+                logger.error(f"Error streaming telemetry: {e}")
+
+    def get_telemetry_columns_json(self, session_id: int, driver_id: int, lap_number: int) -> str:
+        """One lap of telemetry as {channel: [values...]}, serialized by SQLite in one pass."""
+        try:
+            return self._fetch_json(
+                self._Q_TELEMETRY_COLUMNS_JSON, (session_id, driver_id, lap_number),
+                empty=_EMPTY_TELEMETRY_COLUMNS_JSON
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Error getting telemetry columns as JSON: {e}")
+            return _EMPTY_TELEMETRY_COLUMNS_JSON
+
+    def get_telemetry_packed(self, session_id: int, driver_id: int, lap_number: int) -> bytes:
+        """
+        One lap of the car channels quantized to TELEMETRY_PACKED_DTYPE and
+        returned as raw bytes, one record per sample in time order. Missing
+        values are sent as 0.
+        """
+        frame = self.get_telemetry_frame(session_id, driver_id, lap_number)
+        packed = np.zeros(len(frame), dtype=TELEMETRY_PACKED_DTYPE)
+        for name in TELEMETRY_PACKED_DTYPE.names:
+            info = np.iinfo(TELEMETRY_PACKED_DTYPE[name])
+            values = pd.to_numeric(frame[name], errors='coerce').to_numpy(dtype=float, na_value=0.0)
+            packed[name] = np.clip(np.rint(values), info.min, info.max)
+        return packed.tobytes()
 
-    # Additional methods for race results, telemetry, weather, etc., would be implemented similarly.
+    # Additional methods for race results, weather, etc., would be implemented similarly.
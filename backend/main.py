@@ -1,46 +1,194 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Path, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Annotated, Any, Awaitable, Callable, Dict, Hashable, List, Optional, Union
 import uvicorn
+import asyncio
+import hashlib
+import json
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from backend.data_service import F1DataService
+from backend.config import (
+    API_THREADPOOL_SIZE, CORS_ALLOW_ORIGINS, ENV, HTTP_CACHE_MAX_AGE, LIVE_PUSH_INTERVAL,
+    POLLER_LOCK_PATH, CACHE_WARM_INTERVAL,
+)
+from backend.data_service import F1DataService, TELEMETRY_PACKED_DTYPE
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+TELEMETRY_PACKED_DTYPE_HEADER = ",".join(
+    f"{name}:{TELEMETRY_PACKED_DTYPE[name].str}" for name in TELEMETRY_PACKED_DTYPE.names
+)
+
 app = FastAPI(
     title="F1 Data API",
     description="API for accessing Formula 1 data (both historical and live)",
     version="1.0.0"
 )
 
+# The API is read-only and cookie-less: allow GETs from the configured
+# origins and let browsers cache the preflight for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_methods=("GET",),
+    allow_headers=("content-type", "if-none-match"),
+    expose_headers=("etag", "x-telemetry-dtype"),
+    max_age=86400,
 )
+# Compress JSON bodies over 1 KB (telemetry laps run to hundreds of KB).
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Startup: create a global data service instance and start live polling.
 @app.on_event("startup")
 async def startup_event():
+    # Data service calls are blocking (SQLite, Redis); handlers hand them to
+    # this pool with asyncio.to_thread so the event loop keeps serving.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=API_THREADPOOL_SIZE, thread_name_prefix="f1api")
+    )
     app.state.data_service = F1DataService()
-    app.state.data_service.start_live_polling()
-    logger.info("Startup: Data service initialized and live polling started.")
+    app.state.live_subscribers = set()
+    app.state.live_payload = {}
+    # Polling and broadcasting run as tasks on this loop, against the same
+    # service instance that serves requests. Every worker broadcasts to its
+    # own WebSocket clients, but only one of them polls.
+    if claim_live_poller():
+        app.state.poll_task = asyncio.create_task(app.state.data_service.run_live_polling())
+        logger.info("Startup: live polling started in this worker.")
+    app.state.live_task = asyncio.create_task(broadcast_live_updates())
+    app.state.warm_task = asyncio.create_task(warm_cache_periodically())
+    logger.info("Startup: Data service initialized.")
 
 # Shutdown: cleanly close connections.
 @app.on_event("shutdown")
 async def shutdown_event():
+    tasks = [
+        getattr(app.state, name)
+        for name in ("poll_task", "live_task", "warm_task")
+        if hasattr(app.state, name)
+    ]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
     if hasattr(app.state, "data_service"):
         app.state.data_service.close()
         logger.info("Shutdown: Data service closed.")
 
-def get_data_service() -> F1DataService:
-    return app.state.data_service
+# Requests currently being computed, keyed by route and parameters.
+_inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+async def single_flight(key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run compute() once for concurrent identical requests: later callers
+    await the first caller's task instead of repeating the work.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(compute())
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield() so one client disconnecting doesn't cancel the shared work.
+    return await asyncio.shield(task)
+
+def claim_live_poller() -> bool:
+    """
+    Take the poller lock without blocking. With several Uvicorn workers the
+    first process to lock POLLER_LOCK_PATH polls; the lock is held until that
+    process exits. Platforms without fcntl always poll.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return True
+    lock_file = open(POLLER_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    app.state.poller_lock = lock_file
+    return True
+
+def cacheable_response(
+    request: Request,
+    content: Union[str, bytes],
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+    max_age: int = HTTP_CACHE_MAX_AGE
+) -> Response:
+    """
+    Wrap a pre-rendered body with an ETag and Cache-Control, answering 304
+    with no body when the client's If-None-Match already matches. The tag is
+    weak because GZipMiddleware may re-encode the bytes on the way out.
+    """
+    body = content.encode() if isinstance(content, str) else content
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+async def warm_cache_periodically():
+    """
+    Preload the per-year historical bodies at startup, then again every
+    CACHE_WARM_INTERVAL seconds so they are rebuilt ahead of expiry or after
+    a migration has invalidated them.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(app.state.data_service.warm_cache)
+        except Exception as e:
+            logger.error(f"Error warming cache: {e}")
+        await asyncio.sleep(CACHE_WARM_INTERVAL)
+
+async def broadcast_live_updates():
+    """
+    Read the live snapshot from Redis once per interval and push only the
+    fields that changed to every /ws/live subscriber, so backend work does
+    not grow with the number of viewers. Nothing is read while nobody is
+    connected.
+    """
+    while True:
+        subscribers = app.state.live_subscribers
+        if subscribers:
+            try:
+                snapshot = await asyncio.to_thread(app.state.data_service.get_live_snapshot)
+                previous = app.state.live_payload
+                changed = {k: v for k, v in (snapshot or {}).items() if previous.get(k) != v}
+                if changed:
+                    app.state.live_payload = snapshot
+                    targets = list(subscribers)
+                    results = await asyncio.gather(
+                        *(ws.send_json(changed) for ws in targets), return_exceptions=True
+                    )
+                    for ws, result in zip(targets, results):
+                        if isinstance(result, Exception):
+                            subscribers.discard(ws)
+            except Exception as e:
+                logger.error(f"Error broadcasting live updates: {e}")
+        await asyncio.sleep(LIVE_PUSH_INTERVAL)
+
+def get_data_service(request: Request) -> F1DataService:
+    # One service per process, created at startup; requests share its
+    # connection pool, results cache and Redis client.
+    return request.app.state.data_service
+
+# Path parameter bounds: out-of-range values get a 422 before any lookup.
+Year = Annotated[int, Path(ge=1950, le=2100)]
+RoundNumber = Annotated[int, Path(ge=1, le=30)]
+RowId = Annotated[int, Path(ge=1)]
+LapNumber = Annotated[int, Path(ge=1)]
+
+async def known_year(year: Year, data_service: F1DataService = Depends(get_data_service)) -> int:
+    """Reject years with no data with a 404 before running the route's query."""
+    if year not in await asyncio.to_thread(data_service.get_available_years):
+        raise HTTPException(status_code=404, detail="No data for this year")
+    return year
 
 # Pydantic models for API responses.
 class EventModel(BaseModel):
@@ -93,45 +241,232 @@ class StandingModel(BaseModel):
     team_color: str
     points: float
 
+# Telemetry time/session_time are integer nanoseconds (durations); date is
+# integer milliseconds since the Unix epoch (UTC), so it stays below 2**53
+# and survives a JavaScript JSON.parse exactly.
+class TelemetryModel(BaseModel):
+    time: Optional[int]
+    session_time: Optional[int]
+    date: Optional[int]
+    speed: Optional[float]
+    rpm: Optional[float]
+    gear: Optional[int]
+    throttle: Optional[float]
+    brake: bool
+    drs: Optional[int]
+    x: Optional[float]
+    y: Optional[float]
+    z: Optional[float]
+
+class TelemetryColumnsModel(BaseModel):
+    time: List[Optional[int]]
+    session_time: List[Optional[int]]
+    date: List[Optional[int]]
+    speed: List[Optional[float]]
+    rpm: List[Optional[float]]
+    gear: List[Optional[int]]
+    throttle: List[Optional[float]]
+    brake: List[Optional[bool]]
+    drs: List[Optional[int]]
+    x: List[Optional[float]]
+    y: List[Optional[float]]
+    z: List[Optional[float]]
+
+class BootstrapModel(BaseModel):
+    years: List[int]
+    current: Optional[Dict[str, Any]]
+    year: Optional[int]
+    events: List[EventModel]
+
+def prerendered(model: Any) -> Dict[str, Any]:
+    """
+    Route options for a body rendered ahead of time (usually by SQLite) and
+    returned as-is via cacheable_response: no response_model validation or
+    re-encoding runs, so `model` only documents the shape in the OpenAPI schema.
+    """
+    return {
+        "response_class": JSONResponse,
+        "responses": {200: {"model": model}},
+    }
+
+# Historical routes serve immutable, cacheable data (ETag + Cache-Control);
+# live routes read Redis and are never cached. Keeping them on separate
+# routers lets the live side be served by its own process later.
+historical_router = APIRouter(tags=["historical"])
+live_router = APIRouter(tags=["live"])
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the F1 Data API"}
 
-@app.get("/years", response_model=List[int])
+@live_router.websocket("/ws/live")
+async def live_updates(websocket: WebSocket):
+    """
+    Live session, standings, weather, timing, tires and track status. The
+    first message is the full snapshot; later messages carry changed fields only.
+    """
+    state = websocket.app.state
+    await websocket.accept()
+    if state.live_payload:
+        await websocket.send_json(state.live_payload)
+    state.live_subscribers.add(websocket)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        state.live_subscribers.discard(websocket)
+
+@live_router.get("/bootstrap", **prerendered(BootstrapModel))
+async def get_bootstrap(request: Request, data_service: F1DataService = Depends(get_data_service)):
+    """
+    First-load payload for the dashboard in one round-trip: available years,
+    the live session (if any), and the events of the live session's year or,
+    failing that, the latest year.
+    """
+    years, current = await asyncio.gather(
+        asyncio.to_thread(data_service.get_available_years),
+        asyncio.to_thread(data_service.get_current_session)
+    )
+    year = current.get("year") if current and current.get("year") in years else None
+    if year is None and years:
+        year = years[0]
+    events = await asyncio.to_thread(data_service.get_events_json, year) if year is not None else "[]"
+    # events is already JSON text, so it is spliced in rather than re-encoded.
+    body = (
+        f'{{"years":{json.dumps(years)},"current":{json.dumps(current)},'
+        f'"year":{json.dumps(year)},"events":{events}}}'
+    )
+    return cacheable_response(request, body, max_age=0)
+
+@historical_router.get("/years", response_model=List[int])
 async def get_years(data_service: F1DataService = Depends(get_data_service)):
-    return data_service.get_available_years()
+    return await asyncio.to_thread(data_service.get_available_years)
 
-@app.get("/events/{year}", response_model=List[EventModel])
-async def get_events(year: int, data_service: F1DataService = Depends(get_data_service)):
-    return data_service.get_events(year)
+@historical_router.get("/events/{year}", **prerendered(List[EventModel]))
+async def get_events(request: Request, year: int = Depends(known_year), data_service: F1DataService = Depends(get_data_service)):
+    return cacheable_response(request, await asyncio.to_thread(data_service.get_events_json, year))
 
-@app.get("/event/{year}/{round_number}", response_model=EventModel)
-async def get_event(year: int, round_number: int, data_service: F1DataService = Depends(get_data_service)):
-    event = data_service.get_event(year, round_number)
+@historical_router.get("/event/{year}/{round_number}", **prerendered(EventModel))
+async def get_event(
+    round_number: RoundNumber,
+    request: Request,
+    year: int = Depends(known_year),
+    data_service: F1DataService = Depends(get_data_service)
+):
+    event = await asyncio.to_thread(data_service.get_event_json, year, round_number)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event
+    return cacheable_response(request, event)
 
-@app.get("/sessions/{event_id}", response_model=List[SessionModel])
-async def get_sessions(event_id: int, data_service: F1DataService = Depends(get_data_service)):
-    return data_service.get_sessions(event_id)
+@historical_router.get("/sessions/{event_id}", **prerendered(List[SessionModel]))
+async def get_sessions(event_id: RowId, request: Request, data_service: F1DataService = Depends(get_data_service)):
+    return cacheable_response(request, await asyncio.to_thread(data_service.get_sessions_json, event_id))
 
-@app.get("/teams/{year}", response_model=List[TeamModel])
-async def get_teams(year: int, data_service: F1DataService = Depends(get_data_service)):
-    return data_service.get_teams(year)
+@historical_router.get("/teams/{year}", **prerendered(List[TeamModel]))
+async def get_teams(request: Request, year: int = Depends(known_year), data_service: F1DataService = Depends(get_data_service)):
+    return cacheable_response(request, await asyncio.to_thread(data_service.get_teams_json, year))
 
-@app.get("/drivers/{year}", response_model=List[DriverModel])
+@historical_router.get("/drivers/{year}", **prerendered(List[DriverModel]))
 async def get_drivers(
-    year: int,
+    request: Request,
+    year: int = Depends(known_year),
     team_id: Optional[int] = None,
     data_service: F1DataService = Depends(get_data_service)
 ):
-    return data_service.get_drivers(year, team_id)
+    return cacheable_response(
+        request, await asyncio.to_thread(data_service.get_drivers_json, year, team_id)
+    )
+
+@live_router.get("/standings/drivers/{year}", **prerendered(List[StandingModel]))
+async def get_driver_standings(year: Year, request: Request, data_service: F1DataService = Depends(get_data_service)):
+    # Standings may be live, so clients revalidate every time (cheap via 304).
+    standings = await single_flight(
+        ("standings", year), lambda: data_service.get_driver_standings_json(year)
+    )
+    return cacheable_response(request, standings, max_age=0)
+
+@historical_router.get("/telemetry/{session_id}/{driver_id}/{lap_number}", **prerendered(List[TelemetryModel]))
+async def get_telemetry(
+    session_id: RowId,
+    driver_id: RowId,
+    lap_number: LapNumber,
+    request: Request,
+    data_service: F1DataService = Depends(get_data_service)
+):
+    return cacheable_response(
+        request,
+        await asyncio.to_thread(
+            data_service.get_telemetry_json, session_id, driver_id, lap_number
+        )
+    )
+
+@historical_router.get("/telemetry/{session_id}/{driver_id}/{lap_number}/ndjson")
+async def get_telemetry_ndjson(
+    session_id: RowId,
+    driver_id: RowId,
+    lap_number: LapNumber,
+    data_service: F1DataService = Depends(get_data_service)
+):
+    """Same samples as /telemetry, streamed one JSON object per line."""
+    return StreamingResponse(
+        data_service.get_telemetry_ndjson(session_id, driver_id, lap_number),
+        media_type="application/x-ndjson"
+    )
+
+@historical_router.get("/telemetry/{session_id}/{driver_id}/{lap_number}/columns", **prerendered(TelemetryColumnsModel))
+async def get_telemetry_columns(
+    session_id: RowId,
+    driver_id: RowId,
+    lap_number: LapNumber,
+    request: Request,
+    data_service: F1DataService = Depends(get_data_service)
+):
+    """Same samples as /telemetry, laid out as one array per channel."""
+    return cacheable_response(
+        request,
+        await asyncio.to_thread(
+            data_service.get_telemetry_columns_json, session_id, driver_id, lap_number
+        )
+    )
+
+@historical_router.get("/telemetry/{session_id}/{driver_id}/{lap_number}/packed")
+async def get_telemetry_packed(
+    session_id: RowId,
+    driver_id: RowId,
+    lap_number: LapNumber,
+    request: Request,
+    data_service: F1DataService = Depends(get_data_service)
+):
+    """
+    Binary telemetry for charting: little-endian records described by the
+    X-Telemetry-Dtype header (e.g. "speed:<u2,rpm:<u2,gear:|u1,...").
+    """
+    return cacheable_response(
+        request,
+        await asyncio.to_thread(
+            data_service.get_telemetry_packed, session_id, driver_id, lap_number
+        ),
+        media_type="application/octet-stream",
+        headers={"X-Telemetry-Dtype": TELEMETRY_PACKED_DTYPE_HEADER}
+    )
 
-@app.get("/standings/drivers/{year}", response_model=List[StandingModel])
-async def get_driver_standings(year: int, data_service: F1DataService = Depends(get_data_service)):
-    return data_service.get_driver_standings(year)
+app.include_router(historical_router)
+app.include_router(live_router)
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=port, reload=True)
+    # The file watcher is for local development only; it also rules out workers.
+    reload = ENV == "development"
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if reload else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        reload=reload,
+        # Dashboards poll; keep their connections open between requests.
+        timeout_keep_alive=75
+    )
@@ -1,15 +1,22 @@
 import os
 import sqlite3
 import logging
-import time
 import argparse
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import islice, repeat
 
 import fastf1
 import pandas as pd
 from tqdm import tqdm
 
-from config import FASTF1_CACHE_DIR, SQLITE_DB_PATH
-from data_service import F1DataService
+from config import FASTF1_CACHE_DIR, SQLITE_DB_PATH, SQLITE_TELEMETRY_DB_PATH
+from data_service import (
+    ensure_session_order, ensure_driver_standings_cache,
+    refresh_driver_standings, session_order,
+)
+from migration_common import determine_session_type, wait_for_load_slot
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -27,19 +34,168 @@ fastf1.Cache.enable_cache(FASTF1_CACHE_DIR)
 # SQLite Setup and Helpers
 #############################
 
+# Settings for every migration connection, applied as PRAGMA
+# <schema>.<setting> to every attached database. In WAL mode a commit with
+# synchronous=NORMAL appends to the log without an fsync, and readers (the
+# API, the dashboard) don't block the writer. The journal mode itself is set
+# separately so it can be turned off (SQLiteF1Client(wal=False)).
+CONNECT_PRAGMAS = (
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",
+    "mmap_size=268435456",
+    "busy_timeout=5000",
+)
+
+# One-shot migration settings on top of those: no fsync per commit, a 256 MB
+# page cache and an exclusive lock for the duration of the load. finalize()
+# checkpoints and drops back to settings that are safe for the dashboard/API
+# readers.
+BULK_LOAD_PRAGMAS = (
+    "synchronous=OFF",
+    "temp_store=MEMORY",
+    "cache_size=-262144",
+    "mmap_size=30000000000",
+    "locking_mode=EXCLUSIVE",
+)
+
+# Page size for newly created database files. Telemetry rows are ~20
+# columns wide, so larger pages mean fewer page writes per MB loaded.
+NEW_DATABASE_PAGE_SIZE = 8192
+
+# Indexes on the bulk-loaded tables, by name. Maintaining them row by row is
+# most of the insert cost, so create_indexes() builds them once after the
+# load (and a bulk load into populated tables drops them first).
+# Databases created before this have the laps key as an inline UNIQUE.
+# Telemetry needs none: its primary key is the lookup order.
+DEFERRED_INDEXES = {
+    "idx_laps_session_driver_lap": '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_laps_session_driver_lap
+        ON laps(session_id, driver_id, lap_number)
+    ''',
+    "idx_results_session": '''
+        CREATE INDEX IF NOT EXISTS idx_results_session
+        ON results(session_id, position)
+    ''',
+}
+
+# Older layouts of tables create_tables() has since changed, as
+# (column, declared type) pairs that identify them: laps/telemetry times
+# moved from TEXT to INTEGER nanoseconds, and telemetry dropped its rowid
+# `id` for a WITHOUT ROWID primary key.
+LEGACY_COLUMNS = {
+    "laps": (("lap_time", "TEXT"),),
+    "telemetry": (("session_time", "TEXT"), ("id", "INTEGER")),
+}
+
+# Rows per executemany/commit when bulk loading laps, telemetry and weather.
+BULK_INSERT_BATCH_SIZE = 10000
+
+# Fixed column lists for the bulk loaders, so each table gets one prepared
+# INSERT that is reused for every row (missing values are passed as None).
+LAP_COLUMNS = (
+    "session_id", "driver_id", "lap_time", "lap_number", "stint",
+    "pit_out_time", "pit_in_time", "sector1_time", "sector2_time",
+    "sector3_time", "sector1_session_time", "sector2_session_time",
+    "sector3_session_time", "speed_i1", "speed_i2", "speed_fl", "speed_st",
+    "is_personal_best", "compound", "tyre_life", "fresh_tyre",
+    "lap_start_time", "lap_start_date", "track_status", "position",
+    "deleted", "deleted_reason", "fast_f1_generated", "is_accurate", "time",
+    "session_time",
+)
+TELEMETRY_COLUMNS = (
+    "driver_id", "lap_number", "session_id", "time", "session_time", "date",
+    "speed", "rpm", "gear", "throttle", "brake", "drs", "x", "y", "z",
+    "source", "year",
+)
+RESULT_COLUMNS = (
+    "session_id", "driver_id", "position", "classified_position",
+    "grid_position", "q1_time", "q2_time", "q3_time", "race_time", "status",
+    "points",
+)
+WEATHER_COLUMNS = (
+    "session_id", "time", "air_temp", "humidity", "pressure", "rainfall",
+    "track_temp", "wind_direction", "wind_speed",
+)
+EVENT_COLUMNS = (
+    "year", "round_number", "country", "location", "official_event_name",
+    "event_name", "event_date", "event_format", "f1_api_support",
+)
+SESSION_COLUMNS = ("event_id", "name", "date", "session_type", "session_order")
+TEAM_COLUMNS = ("name", "team_id", "team_color", "year")
+DRIVER_COLUMNS = (
+    "driver_number", "broadcast_name", "abbreviation", "driver_id",
+    "first_name", "last_name", "full_name", "headshot_url", "country_code",
+    "team_id", "year",
+)
+
+# Every insert path looks its column order up here.
+TABLE_COLUMNS = {
+    "events": EVENT_COLUMNS,
+    "sessions": SESSION_COLUMNS,
+    "teams": TEAM_COLUMNS,
+    "drivers": DRIVER_COLUMNS,
+    "results": RESULT_COLUMNS,
+    "laps": LAP_COLUMNS,
+    "telemetry": TELEMETRY_COLUMNS,
+    "weather": WEATHER_COLUMNS,
+}
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: str, columns: tuple, or_ignore: bool = False) -> str:
+    """
+    INSERT text for a fixed column list, built once per table so every row
+    reuses the same cached prepared statement. With `or_ignore`, rows
+    violating any of the table's constraints are skipped.
+    """
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    if or_ignore:
+        return sql.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+    return sql
+
 class SQLiteF1Client:
-    def __init__(self, db_path=SQLITE_DB_PATH):
+    def __init__(self, db_path=SQLITE_DB_PATH, bulk_load: bool = False,
+                 telemetry_db_path=SQLITE_TELEMETRY_DB_PATH, wal: bool = True):
         self.db_path = db_path
+        self.wal = wal
+        # Telemetry can live in its own file, attached as "tele", so its bulk
+        # load doesn't grow the main database or its WAL.
+        self.telemetry_db_path = telemetry_db_path
+        self.telemetry_schema = "tele" if telemetry_db_path else "main"
         self.conn = None
         self.cursor = None
-        self.connect()
+        # {year: {key: id}} for teams/drivers, read from the table once per
+        # season and reset by create_teams_bulk()/create_drivers_bulk() (and
+        # by rollback()).
+        self._team_ids = {}
+        self._driver_ids = {}
+        self.connect(bulk_load)
         self.create_tables()
 
-    def connect(self):
+    def connect(self, bulk_load: bool = False):
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
+            # Autocommit mode: transactions are opened explicitly through
+            # transaction() rather than implicitly before each INSERT.
+            self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+            # Plain tuple rows: the migration only reads ids and keys back,
+            # so sqlite3.Row wrappers are pure overhead here.
             self.cursor = self.conn.cursor()
+            if self.telemetry_db_path:
+                self.cursor.execute("ATTACH DATABASE ? AS tele", (self.telemetry_db_path,))
+            for schema in self.schemas():
+                # The page size is fixed once the first page is written (and
+                # by switching to WAL), so it can only be chosen for new files.
+                if not self.cursor.execute(f"PRAGMA {schema}.page_count").fetchone()[0]:
+                    self.cursor.execute(f"PRAGMA {schema}.page_size={NEW_DATABASE_PAGE_SIZE}")
+            pragmas = CONNECT_PRAGMAS + BULK_LOAD_PRAGMAS if bulk_load else CONNECT_PRAGMAS
+            for schema in self.schemas():
+                if self.wal:
+                    mode = self.cursor.execute(f"PRAGMA {schema}.journal_mode=WAL").fetchone()[0]
+                    if mode != "wal":
+                        # e.g. in-memory databases, which can't use WAL
+                        logger.warning(f"{schema} stays in journal_mode={mode}; WAL is not available")
+                for pragma in pragmas:
+                    self.cursor.execute(f"PRAGMA {schema}.{pragma}")
             logger.info(f"Connected to SQLite database: {self.db_path}")
         except sqlite3.Error as e:
             logger.error(f"Error connecting to SQLite: {e}")
@@ -50,184 +206,340 @@ class SQLiteF1Client:
             self.conn.close()
             logger.info("Closed SQLite connection")
 
+    def schemas(self) -> tuple:
+        return ("main", "tele") if self.telemetry_db_path else ("main",)
+
+    def begin(self):
+        """Open a write transaction; transaction() blocks inside it join it."""
+        self.cursor.execute("BEGIN IMMEDIATE")
+
     def commit(self):
         if self.conn:
             self.conn.commit()
 
+    def rollback(self):
+        self.conn.rollback()
+        # Ids cached during the transaction may no longer exist.
+        self._team_ids.clear()
+        self._driver_ids.clear()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed writes in one BEGIN IMMEDIATE ... COMMIT, rolling
+        back on error. Nested uses join the outer transaction.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        self.begin()
+        try:
+            yield
+        except BaseException:
+            self.rollback()
+            raise
+        self.conn.commit()
+
+    def create_indexes(self):
+        """Build the laps/results indexes deferred until after the load."""
+        laps_key = self.cursor.execute(
+            "SELECT 1 FROM pragma_index_list('laps') WHERE \"unique\" AND origin = 'u'"
+        ).fetchone()
+        with self.transaction():
+            for name, ddl in DEFERRED_INDEXES.items():
+                if laps_key and name == "idx_laps_session_driver_lap":
+                    continue
+                self.cursor.execute(ddl)
+
+    def drop_indexes(self):
+        """
+        Drop the deferred indexes ahead of a bulk load, so rows going into
+        already populated tables aren't indexed one at a time. The migration
+        still skips stored laps itself; create_indexes() rebuilds them.
+        """
+        with self.transaction():
+            for name in DEFERRED_INDEXES:
+                self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def finalize(self):
+        """
+        Checkpoint the WAL into the main file and restore durable, shared
+        settings after a bulk load.
+        """
+        self.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        for schema in self.schemas():
+            self.cursor.execute(f"PRAGMA {schema}.synchronous=NORMAL")
+            # The exclusive lock is only released on the next access after
+            # the locking mode changes.
+            self.cursor.execute(f"PRAGMA {schema}.locking_mode=NORMAL")
+            self.cursor.execute(f"SELECT 1 FROM {schema}.sqlite_master LIMIT 1").fetchone()
+
+    def analyze(self):
+        """Refresh planner statistics so the lookup indexes get used."""
+        self.cursor.execute("ANALYZE")
+
+    def refresh_driver_standings(self, year: int):
+        """Rebuild the precomputed season standings once results are loaded."""
+        with self.transaction():
+            refresh_driver_standings(self.cursor, year)
+
+    def _drop_empty_legacy_tables(self):
+        """
+        Drop laps/telemetry tables still in an older layout (see
+        LEGACY_COLUMNS) so the CREATE below rebuilds them: TEXT affinity
+        would turn the nanosecond ints back into strings, and a rowid
+        telemetry table keeps paying for its AUTOINCREMENT. Tables that
+        already hold rows are kept and only reported.
+        """
+        for table, columns in LEGACY_COLUMNS.items():
+            schema = self.telemetry_schema if table == "telemetry" else "main"
+            declared = {row[1]: row[2] for row in self.cursor.execute(f"PRAGMA {schema}.table_info({table})")}
+            if not any(declared.get(column) == kind for column, kind in columns):
+                continue
+            if self.cursor.execute(f"SELECT 1 FROM {schema}.{table} LIMIT 1").fetchone():
+                logger.warning(f"{table} has rows in an older layout; keeping it as is.")
+                continue
+            self.cursor.execute(f"DROP TABLE {schema}.{table}")
+
+        # With telemetry in its own file, readers find it through unqualified
+        # "telemetry" only if the main database has no table of that name.
+        if self.telemetry_schema != "main" and self.cursor.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'telemetry'"
+        ).fetchone():
+            if self.cursor.execute("SELECT 1 FROM main.telemetry LIMIT 1").fetchone():
+                logger.warning("main.telemetry has rows; it will shadow the attached telemetry database.")
+            else:
+                self.cursor.execute("DROP TABLE main.telemetry")
+
     def create_tables(self):
         """Creates the necessary tables if they don't exist yet."""
         try:
-            # Events
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    year INTEGER,
-                    round_number INTEGER,
-                    country TEXT,
-                    location TEXT,
-                    official_event_name TEXT,
-                    event_name TEXT,
-                    event_date TEXT,
-                    event_format TEXT,
-                    f1_api_support INTEGER,
-                    UNIQUE(year, round_number)
-                )
-            ''')
-
-            # Sessions
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    event_id INTEGER,
-                    name TEXT,
-                    date TEXT,
-                    session_type TEXT,
-                    total_laps INTEGER,
-                    session_start_time TEXT,
-                    t0_date TEXT,
-                    UNIQUE(event_id, name),
-                    FOREIGN KEY(event_id) REFERENCES events(id)
-                )
-            ''')
-
-            # Teams
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS teams (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT,
-                    team_id TEXT,
-                    team_color TEXT,
-                    year INTEGER,
-                    UNIQUE(name, year)
-                )
-            ''')
-
-            # Drivers
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS drivers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    driver_number TEXT,
-                    broadcast_name TEXT,
-                    abbreviation TEXT,
-                    driver_id TEXT,
-                    first_name TEXT,
-                    last_name TEXT,
-                    full_name TEXT,
-                    headshot_url TEXT,
-                    country_code TEXT,
-                    team_id INTEGER,
-                    year INTEGER,
-                    UNIQUE(abbreviation, year),
-                    FOREIGN KEY(team_id) REFERENCES teams(id)
-                )
-            ''')
-
-            # Results
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER,
-                    driver_id INTEGER,
-                    position INTEGER,
-                    classified_position TEXT,
-                    grid_position INTEGER,
-                    q1_time TEXT,
-                    q2_time TEXT,
-                    q3_time TEXT,
-                    race_time TEXT,
-                    status TEXT,
-                    points REAL,
-                    UNIQUE(session_id, driver_id),
-                    FOREIGN KEY(session_id) REFERENCES sessions(id),
-                    FOREIGN KEY(driver_id) REFERENCES drivers(id)
-                )
-            ''')
-
-            # Laps
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS laps (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER,
-                    driver_id INTEGER,
-                    lap_time TEXT,
-                    lap_number INTEGER,
-                    stint INTEGER,
-                    pit_out_time TEXT,
-                    pit_in_time TEXT,
-                    sector1_time TEXT,
-                    sector2_time TEXT,
-                    sector3_time TEXT,
-                    sector1_session_time TEXT,
-                    sector2_session_time TEXT,
-                    sector3_session_time TEXT,
-                    speed_i1 REAL,
-                    speed_i2 REAL,
-                    speed_fl REAL,
-                    speed_st REAL,
-                    is_personal_best INTEGER,
-                    compound TEXT,
-                    tyre_life REAL,
-                    fresh_tyre INTEGER,
-                    lap_start_time TEXT,
-                    lap_start_date TEXT,
-                    track_status TEXT,
-                    position INTEGER,
-                    deleted INTEGER,
-                    deleted_reason TEXT,
-                    fast_f1_generated INTEGER,
-                    is_accurate INTEGER,
-                    time TEXT,
-                    session_time TEXT,
-                    UNIQUE(session_id, driver_id, lap_number),
-                    FOREIGN KEY(session_id) REFERENCES sessions(id),
-                    FOREIGN KEY(driver_id) REFERENCES drivers(id)
-                )
-            ''')
-
-            # Telemetry
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS telemetry (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    driver_id INTEGER,
-                    lap_number INTEGER,
-                    session_id INTEGER,
-                    time TEXT,
-                    session_time TEXT,
-                    date TEXT,
-                    speed REAL,
-                    rpm REAL,
-                    gear INTEGER,
-                    throttle REAL,
-                    brake INTEGER,
-                    drs INTEGER,
-                    x REAL,
-                    y REAL,
-                    z REAL,
-                    source TEXT,
-                    year INTEGER,
-                    FOREIGN KEY(session_id) REFERENCES sessions(id),
-                    FOREIGN KEY(driver_id) REFERENCES drivers(id)
-                )
-            ''')
-
-            # Weather
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS weather (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id INTEGER,
-                    time TEXT,
-                    air_temp REAL,
-                    humidity REAL,
-                    pressure REAL,
-                    rainfall INTEGER,
-                    track_temp REAL,
-                    wind_direction INTEGER,
-                    wind_speed REAL,
-                    FOREIGN KEY(session_id) REFERENCES sessions(id)
-                )
-            ''')
-
-            self.commit()
+            with self.transaction():
+                self._drop_empty_legacy_tables()
+
+                # Events
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS events (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        year INTEGER,
+                        round_number INTEGER,
+                        country TEXT,
+                        location TEXT,
+                        official_event_name TEXT,
+                        event_name TEXT,
+                        event_date TEXT,
+                        event_format TEXT,
+                        f1_api_support BOOLEAN,
+                        UNIQUE(year, round_number)
+                    )
+                ''')
+
+                # Sessions
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        event_id INTEGER,
+                        name TEXT,
+                        date TEXT,
+                        session_type TEXT,
+                        total_laps INTEGER,
+                        session_start_time TEXT,
+                        t0_date TEXT,
+                        session_order INTEGER,
+                        UNIQUE(event_id, name),
+                        FOREIGN KEY(event_id) REFERENCES events(id)
+                    )
+                ''')
+
+                # Teams
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS teams (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT,
+                        team_id TEXT,
+                        team_color TEXT,
+                        year INTEGER,
+                        UNIQUE(name, year)
+                    )
+                ''')
+
+                # Drivers
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS drivers (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        driver_number TEXT,
+                        broadcast_name TEXT,
+                        abbreviation TEXT,
+                        driver_id TEXT,
+                        first_name TEXT,
+                        last_name TEXT,
+                        full_name TEXT,
+                        headshot_url TEXT,
+                        country_code TEXT,
+                        team_id INTEGER,
+                        year INTEGER,
+                        UNIQUE(abbreviation, year),
+                        FOREIGN KEY(team_id) REFERENCES teams(id)
+                    )
+                ''')
+
+                # Results
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS results (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id INTEGER,
+                        driver_id INTEGER,
+                        position INTEGER,
+                        classified_position TEXT,
+                        grid_position INTEGER,
+                        q1_time TEXT,
+                        q2_time TEXT,
+                        q3_time TEXT,
+                        race_time TEXT,
+                        status TEXT,
+                        points REAL,
+                        UNIQUE(session_id, driver_id),
+                        FOREIGN KEY(session_id) REFERENCES sessions(id),
+                        FOREIGN KEY(driver_id) REFERENCES drivers(id)
+                    )
+                ''')
+
+                # Laps
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS laps (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id INTEGER,
+                        driver_id INTEGER,
+                        lap_time INTEGER,
+                        lap_number INTEGER,
+                        stint INTEGER,
+                        pit_out_time INTEGER,
+                        pit_in_time INTEGER,
+                        sector1_time INTEGER,
+                        sector2_time INTEGER,
+                        sector3_time INTEGER,
+                        sector1_session_time INTEGER,
+                        sector2_session_time INTEGER,
+                        sector3_session_time INTEGER,
+                        speed_i1 REAL,
+                        speed_i2 REAL,
+                        speed_fl REAL,
+                        speed_st REAL,
+                        is_personal_best BOOLEAN,
+                        compound TEXT,
+                        tyre_life REAL,
+                        fresh_tyre INTEGER,
+                        lap_start_time INTEGER,
+                        lap_start_date INTEGER,
+                        track_status TEXT,
+                        position INTEGER,
+                        deleted BOOLEAN,
+                        deleted_reason TEXT,
+                        fast_f1_generated INTEGER,
+                        is_accurate BOOLEAN,
+                        time INTEGER,
+                        session_time INTEGER,
+                        FOREIGN KEY(session_id) REFERENCES sessions(id),
+                        FOREIGN KEY(driver_id) REFERENCES drivers(id)
+                    )
+                ''')
+                # Kept out of DEFERRED_INDEXES: migrate_laps reads each
+                # session's stored laps through it, also mid bulk load.
+                self.cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_laps_session
+                    ON laps(session_id)
+                ''')
+
+                # Telemetry
+                self.cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {self.telemetry_schema}.telemetry (
+                        driver_id INTEGER,
+                        lap_number INTEGER,
+                        session_id INTEGER,
+                        time INTEGER,
+                        session_time INTEGER,
+                        date INTEGER,
+                        speed REAL,
+                        rpm REAL,
+                        gear INTEGER,
+                        throttle REAL,
+                        brake BOOLEAN,
+                        drs INTEGER,
+                        x REAL,
+                        y REAL,
+                        z REAL,
+                        source TEXT,
+                        year INTEGER,
+                        PRIMARY KEY (session_id, driver_id, lap_number, session_time),
+                        FOREIGN KEY(session_id) REFERENCES sessions(id),
+                        FOREIGN KEY(driver_id) REFERENCES drivers(id)
+                    ) WITHOUT ROWID
+                ''')
+
+                # Weather
+                self.cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS weather (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id INTEGER,
+                        time TEXT,
+                        air_temp REAL,
+                        humidity REAL,
+                        pressure REAL,
+                        rainfall BOOLEAN,
+                        track_temp REAL,
+                        wind_direction INTEGER,
+                        wind_speed REAL,
+                        FOREIGN KEY(session_id) REFERENCES sessions(id)
+                    )
+                ''')
+
+                # Lookup indexes for the API / dashboard read paths. Lookups on
+                # sessions(event_id) are already served by that table's UNIQUE
+                # index; the laps/results indexes are built by
+                # create_indexes() once the bulk data is in.
+                self.cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_events_year
+                    ON events(year, round_number)
+                ''')
+                self.cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_teams_year
+                    ON teams(year, name)
+                ''')
+                self.cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_drivers_year_team
+                    ON drivers(year, team_id)
+                ''')
+
+                # One weather sample per session/time, so re-runs can insert
+                # with OR IGNORE. Older databases may hold duplicates from
+                # before the key existed; keep the first of each. Samples
+                # without a time never conflict under the index, so they stay.
+                if not self.cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_weather_session_time'"
+                ).fetchone():
+                    self.cursor.execute('''
+                        DELETE FROM weather WHERE time IS NOT NULL AND id NOT IN (
+                            SELECT MIN(id) FROM weather GROUP BY session_id, time
+                        )
+                    ''')
+                    if self.cursor.rowcount > 0:
+                        logger.warning(f"Removed {self.cursor.rowcount} duplicate weather samples.")
+                    self.cursor.execute('''
+                        CREATE UNIQUE INDEX idx_weather_session_time
+                        ON weather(session_id, time)
+                    ''')
+
+                # Databases created before session_order existed get the column
+                # added and backfilled here; new ones already have it.
+                ensure_session_order(self.cursor)
+                self.cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_sessions_event_order
+                    ON sessions(event_id, session_order)
+                ''')
+
+                # Precomputed standings, built from any results already present.
+                ensure_driver_standings_cache(self.cursor)
+
             logger.info("Created/verified all tables successfully.")
 
         except sqlite3.Error as e:
@@ -235,73 +547,149 @@ class SQLiteF1Client:
             raise
 
     ###########################
-    # Utility / Insert Methods
+    # Key Lookups
     ###########################
-    # Insert methods go here. For brevity, we'll do a few examples:
+    # Foreign keys are resolved from these dicts, loaded with one query per
+    # call, instead of a SELECT per row.
 
-    def insert_event(self, event_data: dict) -> int:
-        """
-        Insert an event if it doesn't exist. Return event_id (existing or new).
-        """
-        self.cursor.execute("""
-            SELECT id FROM events
-            WHERE year = ? AND round_number = ?
-        """, (event_data['year'], event_data['round_number']))
-        row = self.cursor.fetchone()
-        if row:
-            return row['id']
-
-        self.cursor.execute("""
-            INSERT INTO events (
-                year, round_number, country, location, official_event_name,
-                event_name, event_date, event_format, f1_api_support
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            event_data["year"],
-            event_data["round_number"],
-            event_data["country"],
-            event_data["location"],
-            event_data["official_event_name"],
-            event_data["event_name"],
-            event_data["event_date"],
-            event_data["event_format"],
-            1 if event_data["f1_api_support"] else 0
-        ))
-        self.commit()
-        return self.cursor.lastrowid
-
-    def insert_session(self, session_data: dict) -> int:
+    def event_ids(self, year: int) -> dict:
+        """{round_number: events.id} for a season."""
+        return dict(self.cursor.execute(
+            "SELECT round_number, id FROM events WHERE year = ?", (year,)
+        ).fetchall())
+
+    def session_ids(self, year: int) -> dict:
+        """{(event_id, name): sessions.id} for a season."""
+        return {
+            (event_id, name): session_id
+            for session_id, event_id, name in self.cursor.execute("""
+                SELECT s.id, s.event_id, s.name
+                FROM sessions s JOIN events e ON e.id = s.event_id
+                WHERE e.year = ?
+            """, (year,))
+        }
+
+    def team_ids(self, year: int) -> dict:
+        """{name: teams.id} for a season, read once and then cached."""
+        if year not in self._team_ids:
+            self._team_ids[year] = dict(self.cursor.execute(
+                "SELECT name, id FROM teams WHERE year = ?", (year,)
+            ).fetchall())
+        return self._team_ids[year]
+
+    def driver_ids(self, year: int) -> dict:
+        """{abbreviation: drivers.id} for a season, read once and then cached."""
+        if year not in self._driver_ids:
+            self._driver_ids[year] = dict(self.cursor.execute(
+                "SELECT abbreviation, id FROM drivers WHERE year = ?", (year,)
+            ).fetchall())
+        return self._driver_ids[year]
+
+    ###########################
+    # Insert Methods
+    ###########################
+
+    def _bulk_insert(self, table: str, rows, or_ignore: bool = False) -> int:
         """
-        Insert a session if it doesn't exist. Return session_id.
+        Insert an iterable of row tuples (in TABLE_COLUMNS order) with one
+        prepared statement, one transaction per BULK_INSERT_BATCH_SIZE rows
+        (or the caller's transaction, if one is open). With `or_ignore`,
+        rows violating the table's key are skipped instead of failing the batch.
+        Returns the number of rows inserted.
         """
-        self.cursor.execute("""
-            SELECT id FROM sessions
-            WHERE event_id = ? AND name = ?
-        """, (session_data["event_id"], session_data["name"]))
-        row = self.cursor.fetchone()
-        if row:
-            return row['id']
-
-        self.cursor.execute("""
-            INSERT INTO sessions (
-                event_id, name, date, session_type
-            ) VALUES (?, ?, ?, ?)
-        """, (
-            session_data["event_id"],
-            session_data["name"],
-            session_data["date"],
-            session_data["session_type"]
-        ))
-        self.commit()
-        return self.cursor.lastrowid
-
-    # Additional insert methods for drivers, teams, results, laps, etc. can be added similarly.
+        target = f"{self.telemetry_schema}.telemetry" if table == "telemetry" else table
+        sql = _insert_sql(target, TABLE_COLUMNS[table], or_ignore=or_ignore)
+        rows = iter(rows)
+        before = self.conn.total_changes
+        while True:
+            batch = list(islice(rows, BULK_INSERT_BATCH_SIZE))
+            if not batch:
+                break
+            with self.transaction():
+                self.cursor.executemany(sql, batch)
+        return self.conn.total_changes - before
+
+    def create_events_bulk(self, rows) -> int:
+        # Events already stored for a year/round are left alone.
+        return self._bulk_insert("events", rows, or_ignore=True)
+
+    def create_sessions_bulk(self, rows) -> int:
+        # Sessions already stored for an event/name are left alone.
+        return self._bulk_insert("sessions", rows, or_ignore=True)
+
+    def create_teams_bulk(self, rows) -> int:
+        # Teams already stored for a name/year are left alone.
+        inserted = self._bulk_insert("teams", rows, or_ignore=True)
+        self._team_ids.clear()
+        return inserted
+
+    def create_drivers_bulk(self, rows) -> int:
+        # Drivers already stored for an abbreviation/year are left alone.
+        inserted = self._bulk_insert("drivers", rows, or_ignore=True)
+        self._driver_ids.clear()
+        return inserted
+
+    def create_results_bulk(self, rows) -> int:
+        # Results already stored for a session/driver are left alone.
+        return self._bulk_insert("results", rows, or_ignore=True)
+
+    def create_laps_bulk(self, rows) -> int:
+        return self._bulk_insert("laps", rows)
+
+    def create_telemetry_bulk(self, rows) -> int:
+        # Samples without a session time, or repeating one, can't be keyed.
+        return self._bulk_insert("telemetry", rows, or_ignore=True)
+
+    def create_weather_bulk(self, rows) -> int:
+        # Samples already stored for a session/time are left alone.
+        return self._bulk_insert("weather", rows, or_ignore=True)
+
+    # Additional insert methods for drivers, teams, results, etc. can be added similarly.
     # For brevity, we’ll do them inline in the "migrate_xxx" functions.
 
 #############################
 # Migrate Functions
 #############################
 
+def _ns_column(values: pd.Series) -> pd.Series:
+    """
+    Timedelta column -> integer nanoseconds, Timestamp column -> nanoseconds
+    since the Unix epoch (UTC); laps and telemetry store times this way.
+    The datetime64/timedelta64 buffer is reinterpreted as int64 and NaT
+    masked, giving exact nullable Int64 with no per-value Python work.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert(None)
+        ns = values.to_numpy("datetime64[ns]").view("int64")
+    else:
+        ns = values.to_numpy("timedelta64[ns]").view("int64")
+    return pd.Series(pd.arrays.IntegerArray(ns, values.isna().to_numpy()), index=values.index)
+
+def _flag_column(values: pd.Series) -> pd.Series:
+    """
+    Boolean-ish column -> 0/1 ints with missing values as 0. Going through
+    the nullable "boolean" dtype avoids fillna() on object columns, which
+    pandas deprecates because it silently downcasts.
+    """
+    return values.astype("boolean").fillna(False).astype(int)
+
+def _values(column: pd.Series) -> list:
+    """A column as a list of Python scalars, NaN/NaT/NA as None."""
+    return column.to_numpy(dtype=object, na_value=None).tolist()
+
+def _records(df: pd.DataFrame):
+    """
+    Row tuples from a projected DataFrame, with NaN/NaT/NA passed as None.
+    Each column is converted to Python scalars once and the rows are zipped
+    from those lists, instead of casting the whole frame to object first.
+    """
+    return zip(*(_values(df[column]) for column in df.columns))
+
+def _iso_dates(dates: pd.Series) -> pd.Series:
+    """Format a datetime column the way Timestamp.isoformat() did per row."""
+    return pd.to_datetime(dates).dt.strftime("%Y-%m-%dT%H:%M:%S")
+
 def migrate_events(db: SQLiteF1Client, year: int) -> pd.DataFrame:
     """
     Create or update events for the given year in the DB,
@@ -309,121 +697,80 @@ def migrate_events(db: SQLiteF1Client, year: int) -> pd.DataFrame:
     """
     logger.info(f"Fetching event schedule for {year}")
     schedule = fastf1.get_event_schedule(year)
-    for idx, ev in schedule.iterrows():
-        event_data = {
-            "year": year,
-            "round_number": int(ev["RoundNumber"]),
-            "country": ev["Country"],
-            "location": ev["Location"],
-            "official_event_name": ev["OfficialEventName"],
-            "event_name": ev["EventName"],
-            "event_date": ev["EventDate"].isoformat() if pd.notna(ev["EventDate"]) else None,
-            "event_format": ev["EventFormat"],
-            "f1_api_support": bool(ev["F1ApiSupport"])
-        }
-        db.insert_event(event_data)
+    events = pd.DataFrame({
+        "year": year,
+        "round_number": schedule["RoundNumber"].astype(int),
+        "country": schedule["Country"],
+        "location": schedule["Location"],
+        "official_event_name": schedule["OfficialEventName"],
+        "event_name": schedule["EventName"],
+        "event_date": _iso_dates(schedule["EventDate"]),
+        "event_format": schedule["EventFormat"],
+        "f1_api_support": _flag_column(schedule["F1ApiSupport"]),
+    }, columns=list(EVENT_COLUMNS))
+    # One statement for the whole schedule; rounds already stored are skipped.
+    db.create_events_bulk(_records(events))
     return schedule
 
-def _session_type(session_name: str) -> str:
-    """Helper to classify session name into 'practice', 'qualifying', 'race', etc."""
-    if "Practice" in session_name:
-        return "practice"
-    elif "Qualifying" in session_name:
-        return "qualifying"
-    elif "Sprint" in session_name:
-        if "Shootout" in session_name:
-            return "sprint_shootout"
-        elif "Qualifying" in session_name:
-            return "sprint_qualifying"
-        else:
-            return "sprint"
-    elif "Race" in session_name:
-        return "race"
-    return "unknown"
-
 def migrate_sessions(db: SQLiteF1Client, schedule: pd.DataFrame, year: int):
     """
     For each event in the schedule, insert sessions into DB (FP1, FP2, etc.).
     """
-    for idx, ev in schedule.iterrows():
-        event_id = db.cursor.execute("""
-            SELECT id FROM events WHERE year = ? AND round_number = ?
-        """, (year, int(ev["RoundNumber"]))).fetchone()
-        if not event_id:
+    event_ids = db.event_ids(year)
+
+    # Session1..Session5 columns stacked into one row per session
+    frames = []
+    for i in range(1, 6):
+        if f"Session{i}" not in schedule:
             continue
-        event_id = event_id["id"]
+        frames.append(pd.DataFrame({
+            "event_id": schedule["RoundNumber"].astype(int).map(event_ids),
+            "name": schedule[f"Session{i}"],
+            "date": _iso_dates(schedule[f"Session{i}DateUtc"]),
+        }))
+    if not frames:
+        return
+    sessions = pd.concat(frames, ignore_index=True)
+    sessions = sessions[sessions["event_id"].notna() & sessions["name"].notna()]
+    sessions["event_id"] = sessions["event_id"].astype(int)
+    sessions["session_type"] = sessions["name"].map(determine_session_type)
+    sessions["session_order"] = sessions["session_type"].map(session_order)
 
-        # For each session in 1..5
-        for i in range(1, 6):
-            s_name = ev.get(f"Session{i}")
-            if pd.isna(s_name):
-                continue
-            s_date_utc = ev.get(f"Session{i}DateUtc")
-            s_data = {
-                "event_id": event_id,
-                "name": s_name,
-                "date": s_date_utc.isoformat() if pd.notna(s_date_utc) else None,
-                "session_type": _session_type(s_name)
-            }
-            db.insert_session(s_data)
+    db.create_sessions_bulk(_records(sessions[list(SESSION_COLUMNS)]))
 
 def migrate_teams_and_drivers(db: SQLiteF1Client, session_obj, year: int):
     """
     Insert all teams and drivers from session_obj.results into DB.
     """
-    # Insert teams first
-    for _, row in session_obj.results.iterrows():
-        team_name = row["TeamName"]
-        # Check if team exists
-        db.cursor.execute("""
-            SELECT id FROM teams WHERE name = ? AND year = ?
-        """, (team_name, year))
-        existing_team = db.cursor.fetchone()
-        if existing_team:
-            team_id = existing_team["id"]
-        else:
-            # Insert
-            db.cursor.execute("""
-                INSERT INTO teams (name, team_id, team_color, year)
-                VALUES (?, ?, ?, ?)
-            """, (
-                team_name,
-                row["TeamId"],
-                row["TeamColor"],
-                year
-            ))
-            db.commit()
-            team_id = db.cursor.lastrowid
-
-        # Now driver
-        abbr = row["Abbreviation"]
-        db.cursor.execute("""
-            SELECT id FROM drivers WHERE abbreviation = ? AND year = ?
-        """, (abbr, year))
-        existing_driver = db.cursor.fetchone()
-        if existing_driver:
-            driver_id = existing_driver["id"]
-        else:
-            db.cursor.execute("""
-                INSERT INTO drivers (
-                    driver_number, broadcast_name, abbreviation, driver_id,
-                    first_name, last_name, full_name, headshot_url, country_code,
-                    team_id, year
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                str(row["DriverNumber"]),
-                row["BroadcastName"],
-                abbr,
-                row["DriverId"],
-                row["FirstName"],
-                row["LastName"],
-                row["FullName"],
-                row["HeadshotUrl"],
-                row["CountryCode"],
-                team_id,
-                year
-            ))
-            db.commit()
+    res = session_obj.results
+
+    # Teams first, then the drivers pointing at them
+    teams = res.drop_duplicates("TeamName")
+    teams = teams[~teams["TeamName"].isin(db.team_ids(year))]
+    if len(teams):
+        db.create_teams_bulk(_records(pd.DataFrame({
+            "name": teams["TeamName"],
+            "team_id": teams["TeamId"],
+            "team_color": teams["TeamColor"],
+            "year": year,
+        }, columns=list(TEAM_COLUMNS))))
+
+    drivers = res.drop_duplicates("Abbreviation")
+    drivers = drivers[~drivers["Abbreviation"].isin(db.driver_ids(year))]
+    if len(drivers):
+        db.create_drivers_bulk(_records(pd.DataFrame({
+            "driver_number": drivers["DriverNumber"].astype(str),
+            "broadcast_name": drivers["BroadcastName"],
+            "abbreviation": drivers["Abbreviation"],
+            "driver_id": drivers["DriverId"],
+            "first_name": drivers["FirstName"],
+            "last_name": drivers["LastName"],
+            "full_name": drivers["FullName"],
+            "headshot_url": drivers["HeadshotUrl"],
+            "country_code": drivers["CountryCode"],
+            "team_id": drivers["TeamName"].map(db.team_ids(year)).astype("Int64"),
+            "year": year,
+        }, columns=list(DRIVER_COLUMNS))))
 
 def migrate_results(db: SQLiteF1Client, session_obj, session_id: int, year: int):
     """
@@ -432,49 +779,54 @@ def migrate_results(db: SQLiteF1Client, session_obj, session_id: int, year: int)
     if not hasattr(session_obj, "results") or session_obj.results is None or len(session_obj.results) == 0:
         return
 
-    # Map drivers
-    drivers_map = {}
-    for _, row in session_obj.results.iterrows():
-        abbr = row["Abbreviation"]
-        db.cursor.execute("""
-            SELECT id FROM drivers WHERE abbreviation = ? AND year = ?
-        """, (abbr, year))
-        found = db.cursor.fetchone()
-        if found:
-            drivers_map[abbr] = found["id"]
-
-    for _, row in session_obj.results.iterrows():
-        abbr = row["Abbreviation"]
-        driver_id = drivers_map.get(abbr)
-        if not driver_id:
-            continue
-        # Insert
-        db.cursor.execute("""
-            SELECT id FROM results WHERE session_id = ? AND driver_id = ?
-        """, (session_id, driver_id))
-        if db.cursor.fetchone():
-            continue  # already inserted
-
-        db.cursor.execute("""
-            INSERT INTO results (
-                session_id, driver_id, position, classified_position,
-                grid_position, q1_time, q2_time, q3_time, race_time,
-                status, points
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            session_id,
-            driver_id,
-            int(row["Position"]) if pd.notna(row["Position"]) else None,
-            row["ClassifiedPosition"] if pd.notna(row["ClassifiedPosition"]) else None,
-            int(row["GridPosition"]) if pd.notna(row["GridPosition"]) else None,
-            str(row["Q1"]) if pd.notna(row["Q1"]) else None,
-            str(row["Q2"]) if pd.notna(row["Q2"]) else None,
-            str(row["Q3"]) if pd.notna(row["Q3"]) else None,
-            str(row["Time"]) if pd.notna(row["Time"]) else None,
-            row["Status"] if pd.notna(row["Status"]) else None,
-            float(row["Points"]) if pd.notna(row["Points"]) else None
-        ))
-        db.commit()
+    res = session_obj.results
+    driver_ids = res["Abbreviation"].map(db.driver_ids(year))
+
+    def _text(column):
+        return res[column].astype(str).where(res[column].notna(), None)
+
+    results = pd.DataFrame({
+        "session_id": session_id,
+        "driver_id": driver_ids,
+        "position": res["Position"].astype("Int64"),
+        "classified_position": res["ClassifiedPosition"],
+        "grid_position": res["GridPosition"].astype("Int64"),
+        "q1_time": _text("Q1"),
+        "q2_time": _text("Q2"),
+        "q3_time": _text("Q3"),
+        "race_time": _text("Time"),
+        "status": res["Status"],
+        "points": res["Points"].astype(float),
+    }, columns=list(RESULT_COLUMNS))
+    # Drivers missing from the drivers table are skipped
+    results = results[driver_ids.notna()].astype({"driver_id": int})
+    db.create_results_bulk(_records(results))
+
+def _prepare_telemetry_df(tel: pd.DataFrame, session_id: int, driver_id: int, lap_number: int, year: int) -> list:
+    """
+    One lap of FastF1 telemetry as TELEMETRY_COLUMNS row tuples. Every
+    conversion is a column operation; rows are only formed by the final zip.
+    """
+    n = len(tel)
+    return list(zip(
+        repeat(driver_id, n),
+        repeat(lap_number, n),
+        repeat(session_id, n),
+        _values(_ns_column(tel["Time"])),
+        _values(_ns_column(tel["SessionTime"])),
+        _values(_ns_column(tel["Date"])),
+        _values(tel["Speed"].astype(float)),
+        _values(tel["RPM"].astype(float)),
+        _values(tel["nGear"].astype("Int64")),
+        _values(tel["Throttle"].astype(float)),
+        _values(_flag_column(tel["Brake"])),
+        _values(tel["DRS"].astype("Int64")),
+        _values(tel["X"].astype(float)),
+        _values(tel["Y"].astype(float)),
+        _values(tel["Z"].astype(float)),
+        _values(tel["Source"]),
+        repeat(year, n),
+    ))
 
 def migrate_laps(db: SQLiteF1Client, session_obj, session_id: int, year: int):
     """
@@ -483,121 +835,75 @@ def migrate_laps(db: SQLiteF1Client, session_obj, session_id: int, year: int):
     if not hasattr(session_obj, "laps") or session_obj.laps is None or len(session_obj.laps) == 0:
         return
 
-    # Map drivers
-    drivers_map = {}
-    for _, row in session_obj.results.iterrows():
-        abbr = row["Abbreviation"]
-        db.cursor.execute("""
-            SELECT id FROM drivers WHERE abbreviation = ? AND year = ?
-        """, (abbr, year))
-        found = db.cursor.fetchone()
-        if found:
-            drivers_map[abbr] = found["id"]
+    # Laps already stored for this session, fetched once instead of per lap.
+    existing_laps = set(db.cursor.execute(
+        "SELECT driver_id, lap_number FROM laps WHERE session_id = ?", (session_id,)
+    ))
 
-    # For performance, let's skip advanced telemetry on every lap,
-    # and only do it for "best" laps or every 10th lap, for example.
     laps_df = session_obj.laps
-    for _, lap in tqdm(laps_df.iterrows(), total=len(laps_df), desc="Migrating laps"):
-        abbr = lap["Driver"]
-        driver_id = drivers_map.get(abbr)
-        if not driver_id:
-            continue
-        lap_number = int(lap["LapNumber"]) if pd.notna(lap["LapNumber"]) else None
-        if not lap_number:
-            continue
-
-        # Insert lap
-        db.cursor.execute("""
-            SELECT id FROM laps WHERE session_id = ? AND driver_id = ? AND lap_number = ?
-        """, (session_id, driver_id, lap_number))
-        if db.cursor.fetchone():
-            # already inserted
-            continue
+    driver_ids = laps_df["Driver"].map(db.driver_ids(year))
+    laps = pd.DataFrame({
+        "session_id": session_id,
+        "driver_id": driver_ids,
+        "lap_time": _ns_column(laps_df["LapTime"]),
+        "lap_number": laps_df["LapNumber"].astype("Int64"),
+        "stint": laps_df["Stint"].astype("Int64"),
+        "pit_out_time": _ns_column(laps_df["PitOutTime"]),
+        "pit_in_time": _ns_column(laps_df["PitInTime"]),
+        "sector1_time": _ns_column(laps_df["Sector1Time"]),
+        "sector2_time": _ns_column(laps_df["Sector2Time"]),
+        "sector3_time": _ns_column(laps_df["Sector3Time"]),
+        "sector1_session_time": _ns_column(laps_df["Sector1SessionTime"]),
+        "sector2_session_time": _ns_column(laps_df["Sector2SessionTime"]),
+        "sector3_session_time": _ns_column(laps_df["Sector3SessionTime"]),
+        "speed_i1": laps_df["SpeedI1"].astype(float),
+        "speed_i2": laps_df["SpeedI2"].astype(float),
+        "speed_fl": laps_df["SpeedFL"].astype(float),
+        "speed_st": laps_df["SpeedST"].astype(float),
+        "is_personal_best": _flag_column(laps_df["IsPersonalBest"]),
+        "compound": laps_df["Compound"],
+        "tyre_life": laps_df["TyreLife"].astype(float),
+        "fresh_tyre": _flag_column(laps_df["FreshTyre"]),
+        "lap_start_time": _ns_column(laps_df["LapStartTime"]),
+        "lap_start_date": _ns_column(laps_df["LapStartDate"]),
+        "track_status": laps_df["TrackStatus"],
+        "position": laps_df["Position"].astype("Int64"),
+        "deleted": _flag_column(laps_df["Deleted"]),
+        "deleted_reason": laps_df["DeletedReason"],
+        "fast_f1_generated": _flag_column(laps_df["FastF1Generated"]),
+        "is_accurate": _flag_column(laps_df["IsAccurate"]),
+        "time": _ns_column(laps_df["Time"]),
+        "session_time": _ns_column(laps_df["SessionTime"]),
+    }, columns=list(LAP_COLUMNS))
+    # Skip laps of unknown drivers, without a lap number, or already stored
+    laps = laps[driver_ids.notna() & laps["lap_number"].fillna(0).ne(0)].astype({"driver_id": int})
+    laps = laps[[key not in existing_laps for key in zip(laps["driver_id"], laps["lap_number"])]]
+    laps = laps.drop_duplicates(["driver_id", "lap_number"])
+    lap_rows = _records(laps)
 
-        lap_data = {
-            "session_id": session_id,
-            "driver_id": driver_id,
-            "lap_time": str(lap["LapTime"]) if pd.notna(lap["LapTime"]) else None,
-            "lap_number": lap_number,
-            "stint": int(lap["Stint"]) if pd.notna(lap["Stint"]) else None,
-            "pit_out_time": str(lap["PitOutTime"]) if pd.notna(lap["PitOutTime"]) else None,
-            "pit_in_time": str(lap["PitInTime"]) if pd.notna(lap["PitInTime"]) else None,
-            "sector1_time": str(lap["Sector1Time"]) if pd.notna(lap["Sector1Time"]) else None,
-            "sector2_time": str(lap["Sector2Time"]) if pd.notna(lap["Sector2Time"]) else None,
-            "sector3_time": str(lap["Sector3Time"]) if pd.notna(lap["Sector3Time"]) else None,
-            "sector1_session_time": str(lap["Sector1SessionTime"]) if pd.notna(lap["Sector1SessionTime"]) else None,
-            "sector2_session_time": str(lap["Sector2SessionTime"]) if pd.notna(lap["Sector2SessionTime"]) else None,
-            "sector3_session_time": str(lap["Sector3SessionTime"]) if pd.notna(lap["Sector3SessionTime"]) else None,
-            "speed_i1": float(lap["SpeedI1"]) if pd.notna(lap["SpeedI1"]) else None,
-            "speed_i2": float(lap["SpeedI2"]) if pd.notna(lap["SpeedI2"]) else None,
-            "speed_fl": float(lap["SpeedFL"]) if pd.notna(lap["SpeedFL"]) else None,
-            "speed_st": float(lap["SpeedST"]) if pd.notna(lap["SpeedST"]) else None,
-            "is_personal_best": 1 if (pd.notna(lap["IsPersonalBest"]) and lap["IsPersonalBest"]) else 0,
-            "compound": lap["Compound"] if pd.notna(lap["Compound"]) else None,
-            "tyre_life": float(lap["TyreLife"]) if pd.notna(lap["TyreLife"]) else None,
-            "fresh_tyre": 1 if (pd.notna(lap["FreshTyre"]) and lap["FreshTyre"]) else 0,
-            "lap_start_time": str(lap["LapStartTime"]) if pd.notna(lap["LapStartTime"]) else None,
-            "lap_start_date": lap["LapStartDate"].isoformat() if pd.notna(lap["LapStartDate"]) else None,
-            "track_status": lap["TrackStatus"] if pd.notna(lap["TrackStatus"]) else None,
-            "position": int(lap["Position"]) if pd.notna(lap["Position"]) else None,
-            "deleted": 1 if (pd.notna(lap["Deleted"]) and lap["Deleted"]) else 0,
-            "deleted_reason": lap["DeletedReason"] if pd.notna(lap["DeletedReason"]) else None,
-            "fast_f1_generated": 1 if (pd.notna(lap["FastF1Generated"]) and lap["FastF1Generated"]) else 0,
-            "is_accurate": 1 if (pd.notna(lap["IsAccurate"]) and lap["IsAccurate"]) else 0,
-            "time": str(lap["Time"]) if pd.notna(lap["Time"]) else None,
-            "session_time": str(lap["SessionTime"]) if pd.notna(lap["SessionTime"]) else None
-        }
+    # For performance, let's skip advanced telemetry on every lap,
+    # and only do it for "best" laps or every 10th lap, for example.
+    # Only those laps go back through FastF1's Lap objects.
+    telemetry_rows = []
+    wanted = laps[(laps["is_personal_best"] == 1) | (laps["lap_number"] % 10 == 0)]
+    for (_, lap), driver_id, lap_number in tqdm(
+        zip(laps_df.loc[wanted.index].iterrows(), wanted["driver_id"], wanted["lap_number"]),
+        total=len(wanted), desc="Migrating telemetry"
+    ):
+        try:
+            tel = lap.get_telemetry()
+            if tel is not None and not tel.empty:
+                # Sample it to avoid massive data
+                sample_size = 100
+                if len(tel) > sample_size:
+                    tel = tel.iloc[:: len(tel)//sample_size]
+                telemetry_rows.extend(_prepare_telemetry_df(tel, session_id, int(driver_id), int(lap_number), year))
+        except Exception as e:
+            logger.error(f"Telemetry error lap {lap_number}, driver {lap['Driver']}: {e}")
 
-        # Build dynamic insert
-        keys = ",".join(lap_data.keys())
-        placeholders = ",".join(["?"] * len(lap_data))
-        values = list(lap_data.values())
-
-        db.cursor.execute(f"""
-            INSERT INTO laps ({keys}) VALUES ({placeholders})
-        """, values)
-        db.commit()
-
-        # (Optional) Telemetry
-        # e.g. if personal best or every 10th lap
-        if lap_data["is_personal_best"] == 1 or (lap_number % 10 == 0):
-            try:
-                tel = lap.get_telemetry()
-                if tel is not None and not tel.empty:
-                    # Sample it to avoid massive data
-                    sample_size = 100
-                    if len(tel) > sample_size:
-                        tel = tel.iloc[:: len(tel)//sample_size]
-                    for _, tel_row in tel.iterrows():
-                        # Insert telemetry
-                        tel_data = {
-                            "driver_id": driver_id,
-                            "lap_number": lap_number,
-                            "session_id": session_id,
-                            "time": str(tel_row["Time"]) if pd.notna(tel_row["Time"]) else None,
-                            "session_time": str(tel_row["SessionTime"]) if pd.notna(tel_row["SessionTime"]) else None,
-                            "date": tel_row["Date"].isoformat() if pd.notna(tel_row["Date"]) else None,
-                            "speed": float(tel_row["Speed"]) if pd.notna(tel_row["Speed"]) else None,
-                            "rpm": float(tel_row["RPM"]) if pd.notna(tel_row["RPM"]) else None,
-                            "gear": int(tel_row["nGear"]) if pd.notna(tel_row["nGear"]) else None,
-                            "throttle": float(tel_row["Throttle"]) if pd.notna(tel_row["Throttle"]) else None,
-                            "brake": 1 if (pd.notna(tel_row["Brake"]) and tel_row["Brake"]) else 0,
-                            "drs": int(tel_row["DRS"]) if pd.notna(tel_row["DRS"]) else None,
-                            "x": float(tel_row["X"]) if pd.notna(tel_row["X"]) else None,
-                            "y": float(tel_row["Y"]) if pd.notna(tel_row["Y"]) else None,
-                            "z": float(tel_row["Z"]) if pd.notna(tel_row["Z"]) else None,
-                            "source": tel_row["Source"] if pd.notna(tel_row["Source"]) else None,
-                            "year": year
-                        }
-                        k2 = ",".join(tel_data.keys())
-                        p2 = ",".join(["?"] * len(tel_data))
-                        v2 = list(tel_data.values())
-                        db.cursor.execute(f"""
-                            INSERT INTO telemetry ({k2}) VALUES ({p2})
-                        """, v2)
-                    db.commit()
-            except Exception as e:
-                logger.error(f"Telemetry error lap {lap_number}, driver {abbr}: {e}")
+    db.create_laps_bulk(lap_rows)
+    # All of the session's sampled telemetry is written with one executemany.
+    db.create_telemetry_bulk(telemetry_rows)
 
 def migrate_weather(db: SQLiteF1Client, session_obj, session_id: int):
     """
@@ -606,115 +912,164 @@ def migrate_weather(db: SQLiteF1Client, session_obj, session_id: int):
     if not hasattr(session_obj, "weather_data") or session_obj.weather_data is None or session_obj.weather_data.empty:
         return
     wdf = session_obj.weather_data
-    for _, wrow in wdf.iterrows():
-        time_str = str(wrow["Time"]) if pd.notna(wrow["Time"]) else None
-        # Insert if not existing
-        db.cursor.execute("""
-            SELECT id FROM weather WHERE session_id = ? AND time = ?
-        """, (session_id, time_str))
-        if db.cursor.fetchone():
-            continue
-        # Insert
-        db.cursor.execute("""
-            INSERT INTO weather (
-                session_id, time, air_temp, humidity, pressure, rainfall,
-                track_temp, wind_direction, wind_speed
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            session_id,
-            time_str,
-            float(wrow["AirTemp"]) if pd.notna(wrow["AirTemp"]) else None,
-            float(wrow["Humidity"]) if pd.notna(wrow["Humidity"]) else None,
-            float(wrow["Pressure"]) if pd.notna(wrow["Pressure"]) else None,
-            1 if (pd.notna(wrow["Rainfall"]) and wrow["Rainfall"]) else 0,
-            float(wrow["TrackTemp"]) if pd.notna(wrow["TrackTemp"]) else None,
-            int(wrow["WindDirection"]) if pd.notna(wrow["WindDirection"]) else None,
-            float(wrow["WindSpeed"]) if pd.notna(wrow["WindSpeed"]) else None
-        ))
-    db.commit()
-
-def migrate_session_details(db: SQLiteF1Client, schedule: pd.DataFrame, year: int):
+    weather = pd.DataFrame({
+        "session_id": session_id,
+        "time": wdf["Time"].astype(str).where(wdf["Time"].notna(), None),
+        "air_temp": wdf["AirTemp"].astype(float),
+        "humidity": wdf["Humidity"].astype(float),
+        "pressure": wdf["Pressure"].astype(float),
+        "rainfall": _flag_column(wdf["Rainfall"]),
+        "track_temp": wdf["TrackTemp"].astype(float),
+        "wind_direction": wdf["WindDirection"].astype("Int64"),
+        "wind_speed": wdf["WindSpeed"].astype(float),
+    }, columns=list(WEATHER_COLUMNS))
+    # Samples without a time are stored too; the UNIQUE key lets NULLs repeat,
+    # so OR IGNORE only skips timed samples that are already there.
+    db.create_weather_bulk(_records(weather))
+
+# Concurrent FastF1 downloads. Loading is network-bound; all SQLite writes
+# still happen on the calling thread.
+SESSION_LOAD_WORKERS = 4
+
+# Loaded sessions wait in memory until the writer gets to them, so at most
+# this many loads beyond the running ones are queued at a time.
+SESSION_LOAD_BACKLOG = 8
+
+def _load_session(year: int, round_number: int, number: int):
+    """Download one session, by its number within the event (runs on a worker thread)."""
+    wait_for_load_slot()
+    session_obj = fastf1.get_session(year, round_number, number)
+    session_obj.load()
+    return session_obj
+
+def _session_tasks(schedule: pd.DataFrame, event_ids: dict, session_ids: dict):
     """
-    For each event, for each session, load data from FastF1 and store in DB.
+    (round_number, session number, session name, event name, session_id) for
+    every session the schedule lists for a supported event, so only sessions
+    that exist (and have a row in the DB) are downloaded.
     """
-    for _, ev in tqdm(schedule.iterrows(), total=len(schedule), desc="Events"):
-        if not ev["F1ApiSupport"]:
-            logger.info(f"Skipping event {ev['EventName']} because no F1 API support.")
+    for ev in schedule.itertuples(index=False):
+        if not ev.F1ApiSupport:
+            logger.info(f"Skipping event {ev.EventName} because no F1 API support.")
             continue
         # Get event ID from DB
-        row = db.cursor.execute("""
-            SELECT id FROM events WHERE year = ? AND round_number = ?
-        """, (year, int(ev["RoundNumber"]))).fetchone()
-        if not row:
+        event_id = event_ids.get(int(ev.RoundNumber))
+        if not event_id:
             continue
-        event_id = row["id"]
-
-        # Attempt sessions for known session identifiers
-        # e.g. FP1, FP2, FP3, Q, R, S, SQ, SS, etc.
-        for sid in ["FP1", "FP2", "FP3", "Q", "R", "S", "SQ", "SS"]:
-            try:
-                session_obj = fastf1.get_session(year, ev["RoundNumber"], sid)
-                session_obj.load()
-            except Exception as e:
-                # If session doesn't exist, skip
-                logger.warning(f"No session {sid} for {ev['EventName']}: {e}")
+        for number in range(1, 6):
+            name = getattr(ev, f"Session{number}", None)
+            if not isinstance(name, str) or not name:
                 continue
-
-            # Find the session row in DB
-            db.cursor.execute("""
-                SELECT id FROM sessions WHERE event_id = ? AND name = ?
-            """, (event_id, session_obj.name))
-            sess_row = db.cursor.fetchone()
-            if not sess_row:
-                logger.info(f"Session {session_obj.name} not found in DB, skipping.")
+            session_id = session_ids.get((event_id, name))
+            if not session_id:
+                logger.info(f"Session {name} not found in DB, skipping.")
                 continue
-            session_id = sess_row["id"]
-
-            # Update session with extra details
-            try:
-                # session_start_time, total_laps, t0_date, etc.
-                db.cursor.execute("""
-                    UPDATE sessions
-                    SET total_laps = ?,
-                        session_start_time = ?,
-                        t0_date = ?
-                    WHERE id = ?
-                """, (
-                    session_obj.total_laps if hasattr(session_obj, "total_laps") else None,
-                    str(session_obj.session_start_time) if hasattr(session_obj, "session_start_time") else None,
-                    session_obj.t0_date.isoformat() if (hasattr(session_obj, "t0_date") and session_obj.t0_date) else None,
-                    session_id
-                ))
-                db.commit()
-            except Exception as e2:
-                logger.error(f"Failed to update session row: {e2}")
-
-            # Migrate teams & drivers
-            if hasattr(session_obj, "results") and session_obj.results is not None and len(session_obj.results) > 0:
-                migrate_teams_and_drivers(db, session_obj, year)
-                # Migrate results
-                migrate_results(db, session_obj, session_id, year)
-
-            # Migrate laps (including partial telemetry)
-            if hasattr(session_obj, "laps"):
-                migrate_laps(db, session_obj, session_id, year)
-
-            # Migrate weather
-            migrate_weather(db, session_obj, session_id)
-
-            # Sleep a bit to avoid rate limiting
-            time.sleep(1)
+            yield int(ev.RoundNumber), number, name, ev.EventName, session_id
+
+# Details only known once a session is loaded. Missing values (None) keep
+# whatever the row already has, as the Xata migration does by leaving them out.
+_SESSION_UPDATE_SQL = """
+    UPDATE sessions
+    SET total_laps = COALESCE(?, total_laps),
+        session_start_time = COALESCE(?, session_start_time),
+        t0_date = COALESCE(?, t0_date)
+    WHERE id = ?
+"""
+
+def _write_session_details(db: SQLiteF1Client, session_obj, session_id: int, year: int):
+    """Store one loaded session. Everything goes into one transaction."""
+    with db.transaction():
+        # Update session with extra details
+        try:
+            # session_start_time, total_laps, t0_date, etc.
+            # Each property is read once; FastF1 computes some of them.
+            total_laps = getattr(session_obj, "total_laps", None)
+            start_time = getattr(session_obj, "session_start_time", None)
+            t0_date = getattr(session_obj, "t0_date", None)
+            db.cursor.execute(_SESSION_UPDATE_SQL, (
+                total_laps,
+                str(start_time) if start_time is not None else None,
+                t0_date.isoformat() if t0_date else None,
+                session_id
+            ))
+        except Exception as e2:
+            logger.error(f"Failed to update session row: {e2}")
+
+        # Migrate teams & drivers
+        if hasattr(session_obj, "results") and session_obj.results is not None and len(session_obj.results) > 0:
+            migrate_teams_and_drivers(db, session_obj, year)
+            # Migrate results
+            migrate_results(db, session_obj, session_id, year)
+
+        # Migrate laps (including partial telemetry)
+        if hasattr(session_obj, "laps"):
+            migrate_laps(db, session_obj, session_id, year)
+
+        # Migrate weather
+        migrate_weather(db, session_obj, session_id)
+
+def migrate_session_details(db: SQLiteF1Client, schedule: pd.DataFrame, year: int,
+                            workers: int = SESSION_LOAD_WORKERS):
+    """
+    For each event, for each session, load data from FastF1 and store in DB.
+    Sessions download on a thread pool and are written here, on the thread
+    that owns the SQLite connection, as each one finishes. Loads are
+    submitted as slots free up, so finished sessions can't pile up in memory
+    while the writer is busy. The sessions finished by the time the writer
+    gets to them share one transaction, committed before it waits for the
+    next download so the write lock is never held across one.
+    """
+    event_ids = db.event_ids(year)
+    session_ids = db.session_ids(year)
+    tasks = list(_session_tasks(schedule, event_ids, session_ids))
+    remaining = iter(tasks)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            tqdm(total=len(tasks), desc="Sessions") as progress:
+        while True:
+            for round_number, number, name, event_name, session_id in islice(
+                remaining, workers + SESSION_LOAD_BACKLOG - len(pending)
+            ):
+                future = executor.submit(_load_session, year, round_number, number)
+                pending[future] = (name, event_name, session_id)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            with db.transaction():
+                for future in done:
+                    name, event_name, session_id = pending.pop(future)
+                    progress.update()
+                    try:
+                        session_obj = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to load {name} for {event_name}: {e}")
+                        continue
+                    _write_session_details(db, session_obj, session_id, year)
 
 def main():
     parser = argparse.ArgumentParser(description="Migrate full F1 data to SQLite.")
     parser.add_argument("--year", type=int, required=True, help="Which year to migrate")
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Use fast, non-durable settings and lock the DB for the run")
+    parser.add_argument("--workers", type=int, default=SESSION_LOAD_WORKERS,
+                        help="Concurrent FastF1 session downloads")
     args = parser.parse_args()
 
-    db = SQLiteF1Client(SQLITE_DB_PATH)
+    db = SQLiteF1Client(SQLITE_DB_PATH, bulk_load=args.bulk_load)
     try:
-        schedule = migrate_events(db, args.year)
-        migrate_sessions(db, schedule, args.year)
-        migrate_session_details(db, schedule, args.year)
+        if args.bulk_load:
+            db.drop_indexes()
+        try:
+            schedule = migrate_events(db, args.year)
+            migrate_sessions(db, schedule, args.year)
+            migrate_session_details(db, schedule, args.year, args.workers)
+        finally:
+            # Also after a failed run, so readers aren't left without them
+            db.create_indexes()
+        db.refresh_driver_standings(args.year)
+        db.analyze()
+        if args.bulk_load:
+            db.finalize()
         logger.info("Migration complete!")
     finally:
         db.close()
@@ -2,12 +2,14 @@ import fastf1
 import fastf1.plotting
 import pandas as pd
 import datetime
+import json
 import argparse
 import logging
 import time
 import os
 from tqdm import tqdm
 from xata_client import f1_client
+from migration_common import determine_session_type, wait_for_load_slot
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,17 +29,17 @@ def migrate_events(year):
     logger.info(f"Fetching event schedule for {year}")
     schedule = fastf1.get_event_schedule(year)
     
-    for idx, event in schedule.iterrows():
+    for event in schedule.itertuples(index=False):
         event_data = {
-            "round_number": int(event['RoundNumber']),
+            "round_number": int(event.RoundNumber),
             "year": year,
-            "country": event['Country'],
-            "location": event['Location'],
-            "official_event_name": event['OfficialEventName'],
-            "event_name": event['EventName'],
-            "event_date": event['EventDate'].isoformat() if pd.notna(event['EventDate']) else None,
-            "event_format": event['EventFormat'],
-            "f1_api_support": bool(event['F1ApiSupport'])
+            "country": event.Country,
+            "location": event.Location,
+            "official_event_name": event.OfficialEventName,
+            "event_name": event.EventName,
+            "event_date": event.EventDate.isoformat() if pd.notna(event.EventDate) else None,
+            "event_format": event.EventFormat,
+            "f1_api_support": bool(event.F1ApiSupport)
         }
         
         # Check if event already exists
@@ -51,98 +53,123 @@ def migrate_events(year):
 
 def migrate_sessions(schedule, year):
     """Migrate sessions data for events in a year to Xata"""
-    for idx, event in schedule.iterrows():
+    for event in schedule.itertuples(index=False):
         # Get event from Xata
-        event_record = f1_client.get_event(year, int(event['RoundNumber']))
+        event_record = f1_client.get_event(year, int(event.RoundNumber))
         
         if not event_record:
-            logger.warning(f"Event not found for round {event['RoundNumber']}, skipping sessions")
+            logger.warning(f"Event not found for round {event.RoundNumber}, skipping sessions")
             continue
             
         event_id = event_record.id
         
         # Process each session
         for i in range(1, 6):  # Sessions 1-5
-            session_name = event[f'Session{i}']
+            session_name = getattr(event, f'Session{i}')
             if pd.isna(session_name):
                 continue
                 
-            session_date = event[f'Session{i}Date']
-            session_date_utc = event[f'Session{i}DateUtc']
+            session_date = getattr(event, f'Session{i}Date')
+            session_date_utc = getattr(event, f'Session{i}DateUtc')
             
             session_data = {
                 "event_id": event_id,
                 "name": session_name,
                 "date": session_date_utc.isoformat() if pd.notna(session_date_utc) else None,
-                "session_type": _determine_session_type(session_name)
+                "session_type": determine_session_type(session_name)
             }
             
             # Check if session already exists
             if not f1_client.session_exists(event_id, session_name):
-                logger.info(f"Adding session: {session_name} for {event['EventName']}")
+                logger.info(f"Adding session: {session_name} for {event.EventName}")
                 f1_client.create_session(session_data)
             else:
-                logger.info(f"Session already exists: {session_name} for {event['EventName']}")
+                logger.info(f"Session already exists: {session_name} for {event.EventName}")
 
-def _determine_session_type(session_name):
-    """Helper to determine the type of session"""
-    if "Practice" in session_name:
-        return "practice"
-    elif "Qualifying" in session_name:
-        return "qualifying"
-    elif "Sprint" in session_name:
-        if "Shootout" in session_name:
-            return "sprint_shootout"
-        elif "Qualifying" in session_name:
-            return "sprint_qualifying"
-        else:
-            return "sprint"
-    elif "Race" in session_name:
-        return "race"
-    else:
-        return "unknown"
+# Round/session whose results were used for drivers and teams, per year.
+# Persisted next to the FastF1 cache so re-runs go straight to it instead of
+# scanning the schedule again, and kept in memory for the current run.
+MIGRATION_STATE_PATH = os.path.join(cache_dir, "migration_state.json")
+_reference_sessions = {}
+
+def _load_reference_round(year):
+    """Return (round_number, session_identifier) stored for year, or None."""
+    try:
+        with open(MIGRATION_STATE_PATH) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    entry = state.get(str(year))
+    return (entry["reference_round"], entry["session"]) if entry else None
+
+def _save_reference_round(year, round_number, identifier):
+    try:
+        with open(MIGRATION_STATE_PATH) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state[str(year)] = {"reference_round": round_number, "session": identifier}
+    with open(MIGRATION_STATE_PATH, "w") as f:
+        json.dump(state, f)
+
+def _load_results_session(year, round_number, identifier, event_name):
+    """Load a session's results only; None if it has none."""
+    try:
+        session = fastf1.get_session(year, round_number, identifier)
+        session.load(laps=False, telemetry=False, weather=False, messages=False)
+    except Exception as e:
+        logger.warning(f"Could not load {identifier} results for {event_name}: {e}")
+        return None
+    if hasattr(session, 'results') and len(session.results) > 0:
+        return session
+    return None
+
+def _reference_session(year):
+    """
+    A session with full results for the year: the stored reference round if
+    there is one, otherwise the first race (then qualifying) that has results.
+    """
+    if year in _reference_sessions:
+        return _reference_sessions[year]
+
+    session = None
+    stored = _load_reference_round(year)
+    if stored:
+        session = _load_results_session(year, stored[0], stored[1], f"round {stored[0]}")
+
+    if session is None:
+        schedule = fastf1.get_event_schedule(year)
+        # Try to find a race session with full data; if no race data, try qualifying
+        for identifier in ('R', 'Q'):
+            for event in schedule.itertuples(index=False):
+                session = _load_results_session(year, event.RoundNumber, identifier, event.EventName)
+                if session is not None:
+                    _save_reference_round(year, int(event.RoundNumber), identifier)
+                    break
+            if session is not None:
+                break
+
+    _reference_sessions[year] = session
+    return session
 
 def migrate_drivers_and_teams(year):
     """Migrate drivers and teams data for a specific year to Xata"""
     # Get a reference session to extract driver and team data
-    schedule = fastf1.get_event_schedule(year)
-    
-    # Try to find a race session with full data
-    session = None
-    for idx, event in schedule.iterrows():
-        try:
-            session = fastf1.get_session(year, event['RoundNumber'], 'R')
-            session.load(laps=False, telemetry=False, weather=False)
-            if hasattr(session, 'results') and len(session.results) > 0:
-                break
-        except Exception as e:
-            logger.warning(f"Could not load results for {event['EventName']}: {e}")
-    
-    # If no race data, try qualifying
-    if not session or not hasattr(session, 'results') or len(session.results) == 0:
-        for idx, event in schedule.iterrows():
-            try:
-                session = fastf1.get_session(year, event['RoundNumber'], 'Q')
-                session.load(laps=False, telemetry=False, weather=False)
-                if hasattr(session, 'results') and len(session.results) > 0:
-                    break
-            except Exception as e:
-                logger.warning(f"Could not load results for {event['EventName']} qualifying: {e}")
-    
-    if not session or not hasattr(session, 'results') or len(session.results) == 0:
+    session = _reference_session(year)
+    if session is None:
         logger.warning(f"No valid session with results found for {year}")
         return
     
     # Process teams
     teams_processed = set()
-    for _, driver_data in session.results.iterrows():
-        team_name = driver_data['TeamName']
+    for driver_data in session.results.itertuples(index=False):
+        team_name = driver_data.TeamName
         
         if team_name not in teams_processed:
             team_data = {
                 "name": team_name,
-                "team_id": driver_data['TeamId'],
-                "team_color": driver_data['TeamColor'],
+                "team_id": driver_data.TeamId,
+                "team_color": driver_data.TeamColor,
                 "year": year
             }
             
@@ -156,26 +183,26 @@ def migrate_drivers_and_teams(year):
             teams_processed.add(team_name)
     
     # Process drivers
-    for _, driver_data in session.results.iterrows():
+    for driver_data in session.results.itertuples(index=False):
         # Get team id reference
-        team_record = f1_client.get_team(driver_data['TeamName'], year)
+        team_record = f1_client.get_team(driver_data.TeamName, year)
         
         if not team_record:
-            logger.warning(f"Team {driver_data['TeamName']} not found, skipping driver {driver_data['FullName']}")
+            logger.warning(f"Team {driver_data.TeamName} not found, skipping driver {driver_data.FullName}")
             continue
             
         team_id = team_record.id
         
         driver_info = {
-            "driver_number": str(driver_data['DriverNumber']),
-            "broadcast_name": driver_data['BroadcastName'],
-            "abbreviation": driver_data['Abbreviation'],
-            "driver_id": driver_data['DriverId'],
-            "first_name": driver_data['FirstName'],
-            "last_name": driver_data['LastName'],
-            "full_name": driver_data['FullName'],
-            "headshot_url": driver_data['HeadshotUrl'],
-            "country_code": driver_data['CountryCode'],
+            "driver_number": str(driver_data.DriverNumber),
+            "broadcast_name": driver_data.BroadcastName,
+            "abbreviation": driver_data.Abbreviation,
+            "driver_id": driver_data.DriverId,
+            "first_name": driver_data.FirstName,
+            "last_name": driver_data.LastName,
+            "full_name": driver_data.FullName,
+            "headshot_url": driver_data.HeadshotUrl,
+            "country_code": driver_data.CountryCode,
             "team_id": team_id,
             "year": year  # Add year field for filtering
         }
@@ -189,23 +216,26 @@ def migrate_drivers_and_teams(year):
 
 def migrate_session_details(schedule, year):
     """Migrate detailed session data including results and laps"""
+    # Drivers are looked up once for the whole season, not per session
+    driver_map = {d.abbreviation: d.id for d in f1_client.get_drivers(year)}
+    
     # Process each event
-    for idx, event in tqdm(schedule.iterrows(), desc="Processing events", total=len(schedule)):
+    for event in tqdm(schedule.itertuples(index=False), desc="Processing events", total=len(schedule)):
         # Skip if not supported by F1 API
-        if not event['F1ApiSupport']:
-            logger.info(f"Event {event['EventName']} not supported by F1 API, skipping")
+        if not event.F1ApiSupport:
+            logger.info(f"Event {event.EventName} not supported by F1 API, skipping")
             continue
             
-        event_record = f1_client.get_event(year, int(event['RoundNumber']))
+        event_record = f1_client.get_event(year, int(event.RoundNumber))
         
         if not event_record:
-            logger.warning(f"Event not found for round {event['RoundNumber']}, skipping session details")
+            logger.warning(f"Event not found for round {event.RoundNumber}, skipping session details")
             continue
             
         # Process each session type
         for session_type in ['FP1', 'FP2', 'FP3', 'Q', 'S', 'SQ', 'SS', 'R']:
             try:
-                session = fastf1.get_session(year, event['RoundNumber'], session_type)
+                session = fastf1.get_session(year, event.RoundNumber, session_type)
                 
                 # Get session from Xata
                 session_record = f1_client.get_session(event_record.id, session.name)
@@ -217,18 +247,22 @@ def migrate_session_details(schedule, year):
                 session_id = session_record.id
                 
                 # Load session data
-                logger.info(f"Loading data for {session.name} at {event['EventName']}")
+                logger.info(f"Loading data for {session.name} at {event.EventName}")
                 try:
+                    wait_for_load_slot()
                     session.load()
                 except Exception as e:
                     logger.error(f"Failed to load session: {e}")
                     continue
                 
                 # Update session with additional details
+                total_laps = getattr(session, 'total_laps', None)
+                start_time = getattr(session, 'session_start_time', None)
+                t0_date = getattr(session, 't0_date', None)
                 session_updates = {
-                    "total_laps": session.total_laps if hasattr(session, 'total_laps') else None,
-                    "session_start_time": str(session.session_start_time) if hasattr(session, 'session_start_time') else None,
-                    "t0_date": session.t0_date.isoformat() if hasattr(session, 't0_date') and session.t0_date is not None else None
+                    "total_laps": total_laps,
+                    "session_start_time": str(start_time) if start_time is not None else None,
+                    "t0_date": t0_date.isoformat() if t0_date is not None else None
                 }
                 
                 # Filter out None values
@@ -238,127 +272,130 @@ def migrate_session_details(schedule, year):
                     f1_client.update_session(session_id, session_updates)
                 
                 # Process results
-                migrate_results(session, session_id, year)
+                migrate_results(session, session_id, driver_map)
                 
                 # Process laps data
-                migrate_laps(session, session_id, year)
+                migrate_laps(session, session_id, year, driver_map)
                 
                 # Process weather data
                 migrate_weather(session, session_id)
                 
-                # Throttle to avoid API rate limits
-                time.sleep(1)
-                
             except Exception as e:
-                logger.error(f"Failed to process session {session_type} for event {event['EventName']}: {e}")
+                logger.error(f"Failed to process session {session_type} for event {event.EventName}: {e}")
+
+def _column(values, dtype=object):
+    """Cast a whole column at once, with None in place of missing values."""
+    return values.astype(dtype).astype(object).where(values.notna(), None)
 
-def migrate_results(session, session_id, year):
+def migrate_results(session, session_id, driver_map):
     """Migrate results data for a session"""
     if not hasattr(session, 'results') or len(session.results) == 0:
         logger.warning(f"No results available for session {session.name}")
         return
         
-    # Get all drivers for this year
-    drivers = f1_client.get_drivers(year)
-    driver_map = {d.abbreviation: d.id for d in drivers}
+    res = session.results
+    records = pd.DataFrame({
+        "session_id": session_id,
+        "driver_id": res["Abbreviation"].map(driver_map),
+        "position": _column(res["Position"], "Int64"),
+        "classified_position": _column(res["ClassifiedPosition"]),
+        "grid_position": _column(res["GridPosition"], "Int64"),
+        "q1_time": _column(res["Q1"], str),
+        "q2_time": _column(res["Q2"], str),
+        "q3_time": _column(res["Q3"], str),
+        "race_time": _column(res["Time"], str),
+        "status": _column(res["Status"]),
+        "points": _column(res["Points"], float)
+    })
     
-    for _, result in session.results.iterrows():
-        driver_id = driver_map.get(result['Abbreviation'])
+    for abbreviation, result_data in zip(res["Abbreviation"], records.to_dict(orient="records")):
+        driver_id = result_data["driver_id"]
         
-        if not driver_id:
-            logger.warning(f"Driver {result['Abbreviation']} not found in database, skipping result")
+        if pd.isna(driver_id):
+            logger.warning(f"Driver {abbreviation} not found in database, skipping result")
             continue
         
-        result_data = {
-            "session_id": session_id,
-            "driver_id": driver_id,
-            "position": int(result['Position']) if pd.notna(result['Position']) else None,
-            "classified_position": result['ClassifiedPosition'] if pd.notna(result['ClassifiedPosition']) else None,
-            "grid_position": int(result['GridPosition']) if pd.notna(result['GridPosition']) else None,
-            "q1_time": str(result['Q1']) if pd.notna(result['Q1']) else None,
-            "q2_time": str(result['Q2']) if pd.notna(result['Q2']) else None,
-            "q3_time": str(result['Q3']) if pd.notna(result['Q3']) else None,
-            "race_time": str(result['Time']) if pd.notna(result['Time']) else None,
-            "status": result['Status'] if pd.notna(result['Status']) else None,
-            "points": float(result['Points']) if pd.notna(result['Points']) else None
-        }
-        
         # Check if result already exists
         if not f1_client.result_exists(session_id, driver_id):
-            logger.info(f"Adding result for {result['Abbreviation']} in {session.name}")
+            logger.info(f"Adding result for {abbreviation} in {session.name}")
             f1_client.create_result(result_data)
         else:
-            logger.info(f"Result already exists for {result['Abbreviation']} in {session.name}")
+            logger.info(f"Result already exists for {abbreviation} in {session.name}")
+
+def _lap_records(laps, session_id, driver_map):
+    """Convert a session's laps to Xata lap records in one vectorized pass"""
+    return pd.DataFrame({
+        "session_id": session_id,
+        "driver_id": laps["Driver"].map(driver_map),
+        "lap_time": _column(laps["LapTime"], str),
+        "lap_number": _column(laps["LapNumber"], "Int64"),
+        "stint": _column(laps["Stint"], "Int64"),
+        "pit_out_time": _column(laps["PitOutTime"], str),
+        "pit_in_time": _column(laps["PitInTime"], str),
+        "sector1_time": _column(laps["Sector1Time"], str),
+        "sector2_time": _column(laps["Sector2Time"], str),
+        "sector3_time": _column(laps["Sector3Time"], str),
+        "sector1_session_time": _column(laps["Sector1SessionTime"], str),
+        "sector2_session_time": _column(laps["Sector2SessionTime"], str),
+        "sector3_session_time": _column(laps["Sector3SessionTime"], str),
+        "speed_i1": _column(laps["SpeedI1"], float),
+        "speed_i2": _column(laps["SpeedI2"], float),
+        "speed_fl": _column(laps["SpeedFL"], float),
+        "speed_st": _column(laps["SpeedST"], float),
+        "is_personal_best": _column(laps["IsPersonalBest"], bool),
+        "compound": _column(laps["Compound"]),
+        "tyre_life": _column(laps["TyreLife"], float),
+        "fresh_tyre": _column(laps["FreshTyre"], bool),
+        "lap_start_time": _column(laps["LapStartTime"], str),
+        "lap_start_date": _column(laps["LapStartDate"].map(pd.Timestamp.isoformat, na_action="ignore")),
+        "track_status": _column(laps["TrackStatus"]),
+        "position": _column(laps["Position"], "Int64"),
+        "deleted": _column(laps["Deleted"], bool),
+        "deleted_reason": _column(laps["DeletedReason"]),
+        "fast_f1_generated": _column(laps["FastF1Generated"], bool),
+        "is_accurate": _column(laps["IsAccurate"], bool),
+        "time": _column(laps["Time"], str),
+        "session_time": _column(laps["SessionTime"], str)
+    }, index=laps.index)
 
-def migrate_laps(session, session_id, year):
+def migrate_laps(session, session_id, year, driver_map):
     """Migrate lap data for a session"""
     if not hasattr(session, 'laps') or len(session.laps) == 0:
         logger.warning(f"No lap data available for session {session.name}")
         return
         
-    # Get all drivers for this year
-    drivers = f1_client.get_drivers(year)
-    driver_map = {d.abbreviation: d.id for d in drivers}
-    
     # Batch process laps to avoid too many API calls
     batch_size = 50
     lap_count = 0
     
-    for _, lap in tqdm(session.laps.iterrows(), desc="Processing laps", total=len(session.laps)):
-        driver_id = driver_map.get(lap['Driver'])
-        
-        if not driver_id:
-            logger.warning(f"Driver {lap['Driver']} not found in database, skipping lap")
-            continue
-        
-        # Skip laps without a lap number
-        if pd.isna(lap['LapNumber']):
-            continue
-            
-        lap_number = int(lap['LapNumber'])
-        
-        lap_data = {
-            "session_id": session_id,
-            "driver_id": driver_id,
-            "lap_time": str(lap['LapTime']) if pd.notna(lap['LapTime']) else None,
-            "lap_number": lap_number,
-            "stint": int(lap['Stint']) if pd.notna(lap['Stint']) else None,
-            "pit_out_time": str(lap['PitOutTime']) if pd.notna(lap['PitOutTime']) else None,
-            "pit_in_time": str(lap['PitInTime']) if pd.notna(lap['PitInTime']) else None,
-            "sector1_time": str(lap['Sector1Time']) if pd.notna(lap['Sector1Time']) else None,
-            "sector2_time": str(lap['Sector2Time']) if pd.notna(lap['Sector2Time']) else None,
-            "sector3_time": str(lap['Sector3Time']) if pd.notna(lap['Sector3Time']) else None,
-            "sector1_session_time": str(lap['Sector1SessionTime']) if pd.notna(lap['Sector1SessionTime']) else None,
-            "sector2_session_time": str(lap['Sector2SessionTime']) if pd.notna(lap['Sector2SessionTime']) else None,
-            "sector3_session_time": str(lap['Sector3SessionTime']) if pd.notna(lap['Sector3SessionTime']) else None,
-            "speed_i1": float(lap['SpeedI1']) if pd.notna(lap['SpeedI1']) else None,
-            "speed_i2": float(lap['SpeedI2']) if pd.notna(lap['SpeedI2']) else None,
-            "speed_fl": float(lap['SpeedFL']) if pd.notna(lap['SpeedFL']) else None,
-            "speed_st": float(lap['SpeedST']) if pd.notna(lap['SpeedST']) else None,
-            "is_personal_best": bool(lap['IsPersonalBest']) if pd.notna(lap['IsPersonalBest']) else None,
-            "compound": lap['Compound'] if pd.notna(lap['Compound']) else None,
-            "tyre_life": float(lap['TyreLife']) if pd.notna(lap['TyreLife']) else None,
-            "fresh_tyre": bool(lap['FreshTyre']) if pd.notna(lap['FreshTyre']) else None,
-            "lap_start_time": str(lap['LapStartTime']) if pd.notna(lap['LapStartTime']) else None,
-            "lap_start_date": lap['LapStartDate'].isoformat() if pd.notna(lap['LapStartDate']) else None,
-            "track_status": lap['TrackStatus'] if pd.notna(lap['TrackStatus']) else None,
-            "position": int(lap['Position']) if pd.notna(lap['Position']) else None,
-            "deleted": bool(lap['Deleted']) if pd.notna(lap['Deleted']) else None,
-            "deleted_reason": lap['DeletedReason'] if pd.notna(lap['DeletedReason']) else None,
-            "fast_f1_generated": bool(lap['FastF1Generated']) if pd.notna(lap['FastF1Generated']) else None,
-            "is_accurate": bool(lap['IsAccurate']) if pd.notna(lap['IsAccurate']) else None,
-            "time": str(lap['Time']) if pd.notna(lap['Time']) else None,
-            "session_time": str(lap['SessionTime']) if pd.notna(lap['SessionTime']) else None
-        }
+    laps = session.laps
+    records = _lap_records(laps, session_id, driver_map)
+    
+    for unknown in laps.loc[records["driver_id"].isna(), "Driver"]:
+        logger.warning(f"Driver {unknown} not found in database, skipping lap")
+    
+    # Skip laps without a known driver or a lap number
+    records = records[records["driver_id"].notna() & records["lap_number"].notna()]
+    
+    # For selected interesting laps, add some telemetry data
+    lap_numbers = laps.loc[records.index, "LapNumber"]
+    wants_telemetry = records["is_personal_best"].eq(True) | (lap_numbers % 10 == 0)
+    
+    rows = zip(
+        records.index, laps.loc[records.index, "Driver"], wants_telemetry,
+        records.to_dict(orient="records")
+    )
+    for index, abbreviation, with_telemetry, lap_data in tqdm(rows, desc="Processing laps", total=len(records)):
+        driver_id = lap_data["driver_id"]
+        lap_number = lap_data["lap_number"]
         
         # Check if lap already exists
         if not f1_client.lap_exists(session_id, driver_id, lap_number):
-            logger.info(f"Adding lap {lap_number} for {lap['Driver']}")
+            logger.info(f"Adding lap {lap_number} for {abbreviation}")
             f1_client.create_lap(lap_data)
             
-            # For selected interesting laps, add some telemetry data
-            if lap_data["is_personal_best"] or (lap_number % 10 == 0):
-                migrate_telemetry_for_lap(session, lap, driver_id, year)
+            if with_telemetry:
+                migrate_telemetry_for_lap(session, laps.loc[index], driver_id, year)
                 
             lap_count += 1
             
@@ -367,7 +404,7 @@ def migrate_laps(session, session_id, year):
                 logger.info(f"Processed {lap_count} laps, pausing briefly")
                 time.sleep(2)
         else:
-            logger.info(f"Lap already exists: {lap_number} for {lap['Driver']}")
+            logger.info(f"Lap already exists: {lap_number} for {abbreviation}")
 
 def migrate_telemetry_for_lap(session, lap, driver_id, year):
     """Migrate telemetry data for a specific lap"""
@@ -397,23 +434,32 @@ def migrate_telemetry_for_lap(session, lap, driver_id, year):
         # Get the session ID from the function parameter
         session_id = session
         
-        for idx, tel in telemetry.iterrows():
+        # Cast each sampled channel once; channels FastF1 didn't provide stay unset
+        channels = {
+            "time": ("Time", str),
+            "session_time": ("SessionTime", str),
+            "speed": ("Speed", float),
+            "rpm": ("RPM", float),
+            "gear": ("nGear", "Int64"),
+            "throttle": ("Throttle", float),
+            "brake": ("Brake", bool),
+            "drs": ("DRS", "Int64"),
+            "x": ("X", float),
+            "y": ("Y", float),
+            "z": ("Z", float),
+            "source": ("Source", object)
+        }
+        samples = pd.DataFrame({
+            field: _column(telemetry[column], dtype)
+            for field, (column, dtype) in channels.items() if column in telemetry
+        }, index=telemetry.index)
+        
+        for sample in samples.to_dict(orient="records"):
             tel_data = {
                 "driver_id": driver_id,
                 "lap_number": lap_number,
                 "session_id": session_id,
-                "time": str(tel['Time']) if 'Time' in tel and pd.notna(tel['Time']) else None,
-                "session_time": str(tel['SessionTime']) if 'SessionTime' in tel and pd.notna(tel['SessionTime']) else None,
-                "speed": float(tel['Speed']) if 'Speed' in tel and pd.notna(tel['Speed']) else None,
-                "rpm": float(tel['RPM']) if 'RPM' in tel and pd.notna(tel['RPM']) else None,
-                "gear": int(tel['nGear']) if 'nGear' in tel and pd.notna(tel['nGear']) else None,
-                "throttle": float(tel['Throttle']) if 'Throttle' in tel and pd.notna(tel['Throttle']) else None,
-                "brake": bool(tel['Brake']) if 'Brake' in tel and pd.notna(tel['Brake']) else None,
-                "drs": int(tel['DRS']) if 'DRS' in tel and pd.notna(tel['DRS']) else None,
-                "x": float(tel['X']) if 'X' in tel and pd.notna(tel['X']) else None,
-                "y": float(tel['Y']) if 'Y' in tel and pd.notna(tel['Y']) else None,
-                "z": float(tel['Z']) if 'Z' in tel and pd.notna(tel['Z']) else None,
-                "source": tel['Source'] if 'Source' in tel and pd.notna(tel['Source']) else None,
+                **sample,
                 "year": year
             }
             
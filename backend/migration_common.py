@@ -0,0 +1,59 @@
+# File: backend/migration_common.py
+# Helpers shared by the SQLite and Xata migration scripts.
+
+import threading
+import time
+
+# FastF1 session names map to a handful of types; anything else goes through
+# the substring fallback. Sprint names are matched before "Qualifying" so
+# "Sprint Qualifying" isn't classified as a qualifying session.
+SESSION_TYPES = {
+    "Practice 1": "practice",
+    "Practice 2": "practice",
+    "Practice 3": "practice",
+    "Qualifying": "qualifying",
+    "Sprint Shootout": "sprint_shootout",
+    "Sprint Qualifying": "sprint_qualifying",
+    "Sprint": "sprint",
+    "Race": "race",
+}
+
+def determine_session_type(session_name: str) -> str:
+    """Classify a session name into 'practice', 'qualifying', 'race', etc."""
+    session_type = SESSION_TYPES.get(session_name)
+    if session_type:
+        return session_type
+    if "Practice" in session_name:
+        return "practice"
+    elif "Sprint" in session_name:
+        if "Shootout" in session_name:
+            return "sprint_shootout"
+        elif "Qualifying" in session_name:
+            return "sprint_qualifying"
+        else:
+            return "sprint"
+    elif "Qualifying" in session_name:
+        return "qualifying"
+    elif "Race" in session_name:
+        return "race"
+    return "unknown"
+
+# Minimum spacing, in seconds, between the start of two session downloads
+# across all workers, to stay clear of the F1 API's rate limiting.
+SESSION_LOAD_INTERVAL = 1.0
+
+_load_slot_lock = threading.Lock()
+_next_load_at = 0.0
+
+def wait_for_load_slot():
+    """
+    Block until the caller may start its next download. Sleeps only for
+    whatever is left of SESSION_LOAD_INTERVAL since the previous start.
+    """
+    global _next_load_at
+    with _load_slot_lock:
+        now = time.monotonic()
+        wait = _next_load_at - now
+        _next_load_at = max(now, _next_load_at) + SESSION_LOAD_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
@@ -1,3 +1,4 @@
+import asyncio
 import threading
 import time
 import logging
@@ -19,6 +20,16 @@ from config import (
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Redis keys included in a live snapshot, by snapshot field.
+LIVE_SNAPSHOT_KEYS = {
+    "session": "live_session",
+    "standings": "live_standings",
+    "weather": "live_weather",
+    "timing": "live_timing",
+    "tires": "live_tires",
+    "status": "track_status",
+}
+
 class RedisLiveDataService:
     def __init__(self):
         self.redis_client = redis.Redis(
@@ -48,35 +59,53 @@ class RedisLiveDataService:
     def _poll(self):
         while not self._stop_event.is_set():
             try:
-                # Update live session data (dummy example)
-                live_session = {
-                    "session": "Race",
-                    "year": 2021,
-                    "timestamp": time.time()
-                }
-                self.redis_client.set("live_session", json.dumps(live_session))
-                
-                # Fetch live weather data from Open-Meteo
-                response = requests.get(
-                    WEATHER_SERVICE_URL,
-                    params={
-                        "latitude": WEATHER_LATITUDE,
-                        "longitude": WEATHER_LONGITUDE,
-                        "current_weather": "true"
-                    },
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    current_weather = response.json().get("current_weather", {})
-                    self.redis_client.set("live_weather", json.dumps(current_weather))
-                else:
-                    logger.error(f"Failed to fetch weather data: {response.status_code}")
-                
+                self.poll_once()
                 time.sleep(1)
             except Exception as e:
                 logger.error(f"Error during live data polling: {e}")
                 time.sleep(5)
 
+    async def poll_forever(self, interval=1):
+        """
+        Same cycle as the polling thread, run as an asyncio task: each blocking
+        poll goes to a worker thread and the wait between polls is a plain
+        asyncio.sleep. Stops when the task is cancelled.
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.poll_once)
+                await asyncio.sleep(interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error during live data polling: {e}")
+                await asyncio.sleep(5)
+
+    def poll_once(self):
+        # Update live session data (dummy example)
+        live_session = {
+            "session": "Race",
+            "year": 2021,
+            "timestamp": time.time()
+        }
+        self.redis_client.set("live_session", json.dumps(live_session))
+
+        # Fetch live weather data from Open-Meteo
+        response = requests.get(
+            WEATHER_SERVICE_URL,
+            params={
+                "latitude": WEATHER_LATITUDE,
+                "longitude": WEATHER_LONGITUDE,
+                "current_weather": "true"
+            },
+            timeout=5
+        )
+        if response.status_code == 200:
+            current_weather = response.json().get("current_weather", {})
+            self.redis_client.set("live_weather", json.dumps(current_weather))
+        else:
+            logger.error(f"Failed to fetch weather data: {response.status_code}")
+
     def get_live_session(self):
         try:
             data = self.redis_client.get("live_session")
@@ -95,6 +124,14 @@ class RedisLiveDataService:
             logger.error(f"Error retrieving live standings: {e}")
         return None
 
+    def get_live_standings_json(self):
+        """Live standings as the raw JSON text stored in Redis, or None."""
+        try:
+            return self.redis_client.get("live_standings")
+        except Exception as e:
+            logger.error(f"Error retrieving live standings: {e}")
+        return None
+
     def get_live_weather(self):
         try:
             data = self.redis_client.get("live_weather")
@@ -130,3 +167,15 @@ class RedisLiveDataService:
         except Exception as e:
             logger.error(f"Error retrieving track status: {e}")
         return None
+
+    def get_live_snapshot(self):
+        """All live keys in one MGET round-trip, decoded; missing keys are None."""
+        try:
+            values = self.redis_client.mget(list(LIVE_SNAPSHOT_KEYS.values()))
+            return {
+                field: json.loads(value) if value else None
+                for field, value in zip(LIVE_SNAPSHOT_KEYS, values)
+            }
+        except Exception as e:
+            logger.error(f"Error retrieving live snapshot: {e}")
+        return None
@@ -6,13 +6,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import streamlit as st
 import pandas as pd
 import sqlite3
-from backend.config import SQLITE_DB_PATH
+from backend.config import SQLITE_DB_PATH, SQLITE_TELEMETRY_DB_PATH
 import plotly.express as px
 
 # Utility to get DB connection
 def get_connection():
     conn = sqlite3.connect(SQLITE_DB_PATH)
     conn.row_factory = sqlite3.Row
+    if SQLITE_TELEMETRY_DB_PATH:
+        conn.execute("ATTACH DATABASE ? AS tele", (SQLITE_TELEMETRY_DB_PATH,))
     return conn
 
 ######################
@@ -89,7 +91,7 @@ def page_results():
                 JOIN drivers d ON r.driver_id = d.id
                 JOIN teams t ON d.team_id = t.id
                 WHERE r.session_id = ?
-                ORDER BY r.position
+                ORDER BY r.position IS NULL, r.position
             """, conn, params=(session_id,))
             st.write("## Session Results")
             st.dataframe(res_df)
@@ -142,17 +144,11 @@ def page_lap_times():
 
             # Possibly visualize best laps
             if not laps_df.empty:
-                # Convert lap_time from "0 days 00:01:30.123000" to seconds
-                def to_seconds(ts):
-                    if ts and "days" in ts:
-                        parts = ts.split()
-                        # e.g. "0 days 00:01:30.123000"
-                        if len(parts) >= 3:
-                            hms = parts[2]
-                            hh, mm, ss = hms.split(":")
-                            return int(hh)*3600 + int(mm)*60 + float(ss)
-                    return None
-                laps_df["lap_time_s"] = laps_df["lap_time"].apply(to_seconds)
+                # lap_time is stored in nanoseconds; convert to seconds in one
+                # vectorized pass; missing/unparseable values become NaN.
+                laps_df["lap_time_s"] = pd.to_timedelta(
+                    laps_df["lap_time"], errors="coerce"
+                ).dt.total_seconds()
 
                 fig = px.scatter(
                     laps_df,
@@ -227,7 +223,7 @@ def page_telemetry():
                             SELECT d.id FROM drivers d
                             WHERE d.abbreviation = ? AND d.year = ?
                           )
-                        ORDER BY id
+                        ORDER BY session_time
                     """, conn, params=(session_id, lap_choice, driver_abbr, year))
 
                     st.write("## Telemetry Data")